@@ -1,11 +1,16 @@
 """Fix package inconsistencies command"""
 
 import click
+from contextlib import nullcontext
 from typing import Dict, List, Set, Tuple
 from rich.prompt import Confirm
-from ...core.venv_manager import VenvManager
+from ...core.singletons import get_venv_manager, get_pkg_analyzer
+from ...core.pyproject_manager import PyProjectManager
+from ...core.version_utils import (
+    CONSTRAINT_PREFIXES,
+    CONSTRAINT_PREFIX_PATTERN,
+)
 from ...core.package_analyzer import (
-    PackageAnalyzer,
     DependencySource,
     DependencyInfo,
     PackageStatus,
@@ -17,6 +22,7 @@ from ...ui.console import (
     print_success,
     console,
     progress_status,
+    progress_counter,
     create_summary_panel,
     print_info,
 )
@@ -26,9 +32,6 @@ from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 from pathlib import Path
 
-# Create package analyzer instance
-pkg_analyzer = PackageAnalyzer()
-
 
 @click.command()
 @click.option(
@@ -40,7 +43,8 @@ pkg_analyzer = PackageAnalyzer()
 def fix(yes: bool = False):
     """Fix package inconsistencies"""
     try:
-        manager = VenvManager()
+        manager = get_venv_manager()
+        pkg_analyzer = get_pkg_analyzer()
 
         # Check if we're in a virtual environment
         if not manager.from_env:
@@ -55,8 +59,9 @@ def fix(yes: bool = False):
 
         # Get package information
         with progress_status("Analyzing packages..."):
-            installed_packages = pkg_analyzer.get_installed_packages()
-            requirements = pkg_analyzer._parse_requirements()
+            snapshot = pkg_analyzer.analyze_all()
+            installed_packages = snapshot.installed
+            requirements = snapshot.requirements
 
         if not installed_packages and not requirements:
             print_warning("No packages found to analyze")
@@ -81,52 +86,48 @@ def fix(yes: bool = False):
             console.print("\n[cyan]Package Issues Found:[/cyan]")
 
             for status in fix_order:
+                # 每個區塊累積後一次輸出
+                lines = []
                 if (
                     status == PackageStatus.DUPLICATE
                     and inconsistencies[status]
                 ):
-                    console.print("\n[yellow]Duplicate Packages:[/yellow]")
+                    lines.append("\n[yellow]Duplicate Packages:[/yellow]")
                     for name, versions in inconsistencies[status]:
                         last_version = versions[-1]  # 最後一個版本會被保留
-                        console.print(
+                        lines.append(
                             f"  • [cyan]{name}[/cyan] [dim](versions: {', '.join(versions)}, keep {last_version})[/dim]"
                         )
                 elif (
                     status == PackageStatus.VERSION_MISMATCH
                     and inconsistencies[status]
                 ):
-                    console.print("\n[yellow]Version Mismatches:[/yellow]")
+                    lines.append("\n[yellow]Version Mismatches:[/yellow]")
                     for name, required in inconsistencies[status]:
                         current = installed_packages[canonicalize_name(name)][
                             "installed_version"
                         ]
-                        console.print(
+                        lines.append(
                             f"  • [cyan]{name}[/cyan]: [yellow]{current}[/yellow] → [green]{required}[/green]"
                         )
                 elif (
                     status == PackageStatus.NOT_INSTALLED
                     and inconsistencies[status]
                 ):
-                    console.print("\n[yellow]Missing Packages:[/yellow]")
+                    lines.append("\n[yellow]Missing Packages:[/yellow]")
                     for name in inconsistencies[status]:
-                        version = requirements.get(name, "")
+                        dep_info = requirements.get(canonicalize_name(name))
                         version_display = (
-                            version.version_spec
-                            if hasattr(version, "version_spec")
-                            else (
-                                str(version)
-                                if isinstance(version, Text)
-                                else version
-                            )
+                            dep_info.version_spec if dep_info else ""
                         )
-                        console.print(
+                        lines.append(
                             f"  • [cyan]{name}[/cyan] ({version_display})"
                         )
                 elif (
                     status == PackageStatus.NOT_IN_REQUIREMENTS
                     and inconsistencies[status]
                 ):
-                    console.print("\n[yellow]Not in Requirements:[/yellow]")
+                    lines.append("\n[yellow]Not in Requirements:[/yellow]")
                     for name in inconsistencies[status]:
                         version = installed_packages[canonicalize_name(name)][
                             "installed_version"
@@ -136,19 +137,22 @@ def fix(yes: bool = False):
                             if use_pyproject
                             else "requirements.txt"
                         )
-                        console.print(
+                        lines.append(
                             f"  • [cyan]{name}[/cyan] ({version}) [dim](missing from {missing_from})[/dim]"
                         )
                 elif (
                     status == PackageStatus.REDUNDANT
                     and inconsistencies[status]
                 ):
-                    console.print("\n[yellow]Redundant Packages:[/yellow]")
+                    lines.append("\n[yellow]Redundant Packages:[/yellow]")
                     for name in inconsistencies[status]:
-                        console.print(
+                        lines.append(
                             f"  • [cyan]{name}[/cyan] (listed in requirements but also a dependency)"
                         )
 
+                if lines:
+                    console.print("\n".join(lines))
+
             # Confirm fixes
             console.print()
             if not yes and not Confirm.ask("Do you want to fix these issues?"):
@@ -158,109 +162,91 @@ def fix(yes: bool = False):
         fixed_count = 0
         error_count = 0
 
-        # Fix version mismatches
-        if inconsistencies[PackageStatus.VERSION_MISMATCH]:
-            with progress_status("Updating package versions..."):
-                for name, required in inconsistencies[
-                    PackageStatus.VERSION_MISMATCH
-                ]:
-                    try:
-                        # 清理版本字符串，移除前導的版本約束符號
-                        version_clean = str(required).lstrip("=")
-                        if not any(
-                            version_clean.startswith(op)
-                            for op in [">=", "<=", "!=", "~=", ">", "<", "=="]
-                        ):
-                            version_clean = version_clean.strip()
-
-                        # 使用自動修復安裝
-                        pkg_info = manager.package_manager.auto_fix_install(
-                            name, version_clean
+        # Collect version mismatches and missing packages for one pip run
+        install_specs = []  # (name, version, is_update)
+        for name, required in inconsistencies[PackageStatus.VERSION_MISMATCH]:
+            # 清理版本字符串，移除前導的版本約束符號
+            version_clean = str(required).lstrip("=")
+            if not version_clean.startswith(CONSTRAINT_PREFIXES):
+                version_clean = version_clean.strip()
+            install_specs.append((name, version_clean, True))
+
+        for name in inconsistencies[PackageStatus.NOT_INSTALLED]:
+            # requirements 的值一律是 DependencyInfo，直接取用版本規範
+            dep_info = requirements.get(canonicalize_name(name))
+            version_clean = dep_info.version_spec if dep_info else ""
+            install_specs.append((name, version_clean, False))
+
+        if install_specs:
+            with progress_status("Installing packages..."):
+                try:
+                    # 使用自動修復安裝，一次安裝所有套件
+                    install_results = (
+                        manager.package_manager.auto_fix_install_batch(
+                            [(name, ver) for name, ver, _ in install_specs]
                         )
-
-                        if pkg_info.get("status") == "installed":
-                            fixed_count += 1
-                            if pkg_info.get("auto_fixed"):
-                                print_warning(
-                                    f"Auto-fixed [cyan]{name}[/cyan]: [yellow]{pkg_info['original_version']}[/yellow] "
-                                    f"([yellow]{pkg_info['update_reason']}[/yellow]) → [green]{pkg_info['installed_version']}[/green]"
-                                )
-                            else:
-                                print_success(
-                                    f"Updated [cyan]{name}[/cyan] to version [green]{version_clean}[/green]"
-                                )
-                        else:
-                            error_count += 1
-                            print_error(
-                                f"Failed to update [cyan]{name}[/cyan]: {pkg_info.get('message', 'Unknown error')}"
-                            )
-                            if pkg_info.get("version_info"):
-                                console.print(
-                                    f"[dim][yellow]Available versions:[/yellow] {pkg_info['version_info']['latest_versions']}[/dim]"
-                                )
-                    except Exception as e:
-                        error_count += 1
-                        print_error(
-                            f"Failed to update [cyan]{name}[/cyan]: {str(e)}"
+                    )
+                except Exception as e:
+                    install_results = {
+                        name: {"status": "error", "message": str(e)}
+                        for name, _, _ in install_specs
+                    }
+
+            for name, version_clean, is_update in install_specs:
+                pkg_info = install_results.get(name, {})
+                action = "update" if is_update else "install"
+
+                if pkg_info.get("status") == "installed":
+                    fixed_count += 1
+                    if pkg_info.get("auto_fixed"):
+                        print_warning(
+                            f"Auto-fixed [cyan]{name}[/cyan]: [yellow]{pkg_info['original_version']}[/yellow] "
+                            f"([yellow]{pkg_info['update_reason']}[/yellow]) → [green]{pkg_info['installed_version']}[/green]"
                         )
-
-        # Install missing packages
-        if inconsistencies[PackageStatus.NOT_INSTALLED]:
-            with progress_status("Installing missing packages..."):
-                for name in inconsistencies[PackageStatus.NOT_INSTALLED]:
-                    try:
-                        version = requirements.get(name, "")
-                        # 處理 DependencyInfo 對象的版本清理
-                        if hasattr(version, "version_spec"):
-                            version_clean = version.version_spec
-                        elif isinstance(version, Text):
-                            version_clean = str(version)
-                        else:
-                            version_clean = str(version).lstrip("=")
-
-                        # 使用自動修復安裝
-                        pkg_info = manager.package_manager.auto_fix_install(
-                            name, version_clean
+                    elif is_update:
+                        print_success(
+                            f"Updated [cyan]{name}[/cyan] to version [green]{version_clean}[/green]"
                         )
-
-                        if pkg_info.get("status") == "installed":
-                            fixed_count += 1
-                            if pkg_info.get("auto_fixed"):
-                                print_warning(
-                                    f"Auto-fixed [cyan]{name}[/cyan]: [yellow]{pkg_info['original_version']}[/yellow] "
-                                    f"([yellow]{pkg_info['update_reason']}[/yellow]) → [green]{pkg_info['installed_version']}[/green]"
-                                )
-                            else:
-                                print_success(
-                                    f"Installed [cyan]{name}[/cyan] {version_clean if version_clean else ''}"
-                                )
-                        else:
-                            error_count += 1
-                            print_error(
-                                f"Failed to install [cyan]{name}[/cyan]: {pkg_info.get('message', 'Unknown error')}"
-                            )
-                            if pkg_info.get("version_info"):
-                                console.print(
-                                    f"[dim][yellow]Available versions:[/yellow] {pkg_info['version_info']['latest_versions']}[/dim]"
-                                )
-                    except Exception as e:
-                        error_count += 1
-                        print_error(
-                            f"Failed to install [cyan]{name}[/cyan]: {str(e)}"
+                    else:
+                        print_success(
+                            f"Installed [cyan]{name}[/cyan] {version_clean if version_clean else ''}"
                         )
+                else:
+                    error_count += 1
+                    print_error(
+                        f"Failed to {action} [cyan]{name}[/cyan]: {pkg_info.get('message', 'Unknown error')}"
+                    )
+                    if pkg_info.get("version_info"):
+                        console.print(
+                            f"[dim][yellow]Available versions:[/yellow] {pkg_info['version_info']['latest_versions']}[/dim]"
+                        )
+
+        # 設定檔路徑只檢查一次，避免在迴圈中重複 stat
+        pyproject_path = pkg_analyzer.project_path / "pyproject.toml"
+        requirements_path = pkg_analyzer.project_path / "requirements.txt"
+        has_requirements = requirements_path.exists()
+
+        # 如果使用 pyproject.toml，先初始化 PyProjectManager，所有修改只寫入一次
+        proj_manager = None
+        if use_pyproject:
+            proj_manager = PyProjectManager(pyproject_path)
+        pyproject_bulk = (
+            proj_manager.bulk_operation if proj_manager else nullcontext
+        )
 
         # Handle redundant packages
         if inconsistencies[PackageStatus.REDUNDANT]:
-            with progress_status("Optimizing package dependencies..."):
-                # 如果使用 pyproject.toml，先初始化 PyProjectManager
-                proj_manager = None
-                if use_pyproject:
-                    from ...core.pyproject_manager import PyProjectManager
-
-                    proj_manager = PyProjectManager(
-                        pkg_analyzer.project_path / "pyproject.toml"
-                    )
-
+            with progress_status(
+                "Optimizing package dependencies..."
+            ), pyproject_bulk():
+                # pyproject.toml 的依賴名稱只解析一次，迴圈中改用集合查詢
+                pyproject_deps = (
+                    frozenset(proj_manager.get_dependencies())
+                    if proj_manager
+                    else frozenset()
+                )
+                # 收集所有要移除的套件，requirements.txt 只在迴圈後寫入一次
+                removed = []  # (name_with_extras, in_pyproject)
                 for name in inconsistencies[PackageStatus.REDUNDANT]:
                     try:
                         # 獲取完整的套件資訊（包含 extras）
@@ -272,49 +258,54 @@ def fix(yes: bool = False):
                         )
 
                         # 同時從兩個文件中移除冗餘套件
-                        if use_pyproject and proj_manager:
-                            # 先檢查套件是否在 pyproject.toml 中
-                            deps = proj_manager.get_dependencies()
-                            if name in deps:
-                                proj_manager.remove_dependency(name)
-
-                        # 檢查並從 requirements.txt 中移除
-                        if Path("requirements.txt").exists():
-                            manager.package_manager._update_requirements(
-                                removed=[pkg_name_with_extras]
-                            )
+                        in_pyproject = name in pyproject_deps
+                        if in_pyproject:
+                            proj_manager.remove_dependency(name)
 
-                        fixed_count += 1
-                        if use_pyproject and proj_manager and name in deps:
-                            print_success(
-                                f"Removed [cyan]{pkg_name_with_extras}[/cyan] from both pyproject.toml and requirements.txt"
-                            )
-                        else:
-                            print_success(
-                                f"Removed [cyan]{pkg_name_with_extras}[/cyan] from requirements.txt"
-                            )
+                        removed.append((pkg_name_with_extras, in_pyproject))
                     except Exception as e:
                         error_count += 1
                         print_error(
                             f"Failed to remove [cyan]{name}[/cyan]: {str(e)}"
                         )
 
+                # 檢查並從 requirements.txt 中移除
+                if removed and has_requirements:
+                    try:
+                        manager.package_manager._update_requirements(
+                            removed=[pkg_name for pkg_name, _ in removed]
+                        )
+                    except Exception as e:
+                        error_count += len(removed)
+                        for pkg_name, _ in removed:
+                            print_error(
+                                f"Failed to remove [cyan]{pkg_name}[/cyan]: {str(e)}"
+                            )
+                        removed = []
+
+                for pkg_name, in_pyproject in removed:
+                    fixed_count += 1
+                    if in_pyproject:
+                        print_success(
+                            f"Removed [cyan]{pkg_name}[/cyan] from both pyproject.toml and requirements.txt"
+                        )
+                    else:
+                        print_success(
+                            f"Removed [cyan]{pkg_name}[/cyan] from requirements.txt"
+                        )
+
         # Handle not in requirements packages
         if inconsistencies[PackageStatus.NOT_IN_REQUIREMENTS]:
-            with progress_status(
-                f"Adding packages to {'pyproject.toml' if use_pyproject else 'requirements.txt'}..."
-            ):
+            with progress_counter(
+                f"Adding packages to {'pyproject.toml' if use_pyproject else 'requirements.txt'}...",
+                len(inconsistencies[PackageStatus.NOT_IN_REQUIREMENTS]),
+            ) as advance, pyproject_bulk():
                 for name in inconsistencies[PackageStatus.NOT_IN_REQUIREMENTS]:
                     try:
+                        version = installed_packages[canonicalize_name(name)][
+                            "installed_version"
+                        ]
                         if use_pyproject:
-                            # Initialize PyProjectManager
-                            from ...core.pyproject_manager import (
-                                PyProjectManager,
-                            )
-
-                            proj_manager = PyProjectManager(
-                                Path("pyproject.toml")
-                            )
                             # Add to pyproject.toml with >= constraint
                             proj_manager.add_dependency(name, version, ">=")
                             fixed_count += 1
@@ -335,50 +326,34 @@ def fix(yes: bool = False):
                         print_error(
                             f"Failed to add [cyan]{name}[/cyan]: {str(e)}"
                         )
+                    finally:
+                        advance()
 
         # Handle duplicate packages
         if inconsistencies[PackageStatus.DUPLICATE]:
-            with progress_status("Fixing duplicate package definitions..."):
+            with progress_counter(
+                "Fixing duplicate package definitions...",
+                len(inconsistencies[PackageStatus.DUPLICATE]),
+            ) as advance, pyproject_bulk():
                 for name, versions in inconsistencies[PackageStatus.DUPLICATE]:
                     try:
                         if use_pyproject:
-                            # Initialize PyProjectManager
-                            from ...core.pyproject_manager import (
-                                PyProjectManager,
-                            )
-
-                            proj_manager = PyProjectManager(
-                                Path("pyproject.toml")
-                            )
-
                             # 先移除所有該套件的定義
                             proj_manager.remove_dependency(name)
 
-                            # 清理版本字符串，保留版本約束符號
+                            # 從版本字符串中提取約束符號和版本號，
+                            # 未指定約束符號時視為 ==
                             version_clean = versions[-1].strip()
-                            if not any(
-                                version_clean.startswith(op)
-                                for op in [
-                                    ">=",
-                                    "<=",
-                                    "!=",
-                                    "~=",
-                                    ">",
-                                    "<",
-                                    "==",
-                                ]
-                            ):
-                                version_clean = f"=={version_clean}"
-
-                            # 從版本字符串中提取約束符號和版本號
-                            constraint = ""
-                            for op in [">=", "<=", "!=", "~=", ">", "<", "=="]:
-                                if version_clean.startswith(op):
-                                    constraint = op
-                                    version_clean = version_clean[
-                                        len(op) :
-                                    ].strip()
-                                    break
+                            constraint_match = CONSTRAINT_PREFIX_PATTERN.match(
+                                version_clean
+                            )
+                            if constraint_match:
+                                constraint = constraint_match.group()
+                                version_clean = version_clean[
+                                    constraint_match.end() :
+                                ].strip()
+                            else:
+                                constraint = "=="
 
                             # 使用提取的約束符號和版本號重新添加依賴
                             proj_manager.add_dependency(
@@ -390,9 +365,9 @@ def fix(yes: bool = False):
                             )
                         else:
                             # 處理 requirements.txt 的邏輯保持不變
-                            if Path("requirements.txt").exists():
+                            if has_requirements:
                                 # 先讀取所有該套件的定義
-                                with open("requirements.txt", "r") as f:
+                                with open(requirements_path, "r") as f:
                                     lines = f.readlines()
 
                                 # 收集所有該套件的版本定義
@@ -408,17 +383,8 @@ def fix(yes: bool = False):
 
                                 # 清理版本字符串，移除前導的版本約束符號
                                 version_clean = versions[-1].lstrip("=")
-                                if not any(
-                                    version_clean.startswith(op)
-                                    for op in [
-                                        ">=",
-                                        "<=",
-                                        "!=",
-                                        "~=",
-                                        ">",
-                                        "<",
-                                        "==",
-                                    ]
+                                if not version_clean.startswith(
+                                    CONSTRAINT_PREFIXES
                                 ):
                                     version_clean = version_clean.strip()
 
@@ -437,6 +403,8 @@ def fix(yes: bool = False):
                         print_error(
                             f"Failed to fix duplicate package [cyan]{name}[/cyan]: {str(e)}"
                         )
+                    finally:
+                        advance()
 
         # Show summary
         console.print()
@@ -2,8 +2,7 @@
 
 import click
 from typing import List, Dict
-from ...core.venv_manager import VenvManager
-from ...core.package_analyzer import PackageAnalyzer
+from ...core.singletons import get_venv_manager
 from ...ui.console import (
     print_error,
     print_warning,
@@ -13,9 +12,6 @@ from ...ui.console import (
 )
 from ...ui.style import SymbolType
 
-# Create package analyzer instance
-pkg_analyzer = PackageAnalyzer()
-
 
 @click.command()
 @click.argument("packages", nargs=-1, required=True)
@@ -25,7 +21,7 @@ def remove(packages: List[str]):
     PACKAGES: One or more package names to remove
     """
     try:
-        manager = VenvManager()
+        manager = get_venv_manager()
 
         # Check if we're in a virtual environment
         if not manager.from_env:
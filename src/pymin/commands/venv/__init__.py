@@ -0,0 +1,8 @@
+"""Virtual environment management commands"""
+
+from .info_command import info
+from .activate_command import activate
+from .deactivate_command import deactivate
+from .venv_command import venv
+
+__all__ = ["info", "activate", "deactivate", "venv"]
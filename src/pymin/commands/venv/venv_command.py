@@ -0,0 +1,183 @@
+"""Virtual environment creation command"""
+
+import click
+import sys
+import time
+from pathlib import Path
+from ...ui.formatting import Text
+from ...ui.console import (
+    print_success,
+    print_error,
+    print_warning,
+    confirm,
+    progress_status,
+    console,
+    display_panel,
+    print_tips,
+)
+from ...ui.style import StyleType, SymbolType
+from ...core.events import events, EventType
+
+
+class VenvError(click.ClickException):
+    """Environment creation failure reported through click"""
+
+    def format_message(self) -> str:
+        return f"Failed to create environment: {self.message}"
+
+    def show(self, file=None) -> None:
+        print_error(self.format_message())
+
+
+@click.command()
+@click.argument(
+    "name",
+    required=False,
+    type=click.Path(path_type=Path, resolve_path=True),
+)
+@click.option("-y", "--yes", is_flag=True, help="Skip confirmation prompt")
+@click.option(
+    "-r",
+    "--rebuild",
+    is_flag=True,
+    help="Rebuild the environment if it already exists",
+)
+def venv(name: Path = None, yes: bool = False, rebuild: bool = False):
+    """Create a new virtual environment
+
+    If NAME is not provided, it defaults to 'env' in the current directory.
+    """
+    # 只在實際執行時才載入較重的模組，縮短 CLI 啟動時間
+    from ...core.singletons import get_venv_manager
+
+    manager = get_venv_manager()
+    # click 已將 NAME 解析為絕對路徑
+    venv_path = name or Path.cwd() / "env"
+
+    # Check if environment exists
+    if venv_path.exists():
+        if not rebuild:
+            if not yes:
+                # 非互動模式下無法詢問，視同預設的「不重建」
+                if not sys.stdin.isatty():
+                    print_warning(
+                        f"Environment {venv_path} already exists. Use --rebuild or --yes to replace it."
+                    )
+                    return
+
+                if not confirm(
+                    f"\nEnvironment {venv_path} already exists. Rebuild?",
+                    default=False,
+                ):
+                    return
+            rebuild = True
+
+    # Create environment
+    with progress_status("Creating virtual environment...") as status:
+
+        def on_venv_creating(venv_path):
+            status.update(
+                f"Creating virtual environment: [bold]{venv_path}[/bold]..."
+            )
+
+        def on_venv_retrieving(venv_path):
+            status.update(f"Retrieving installed system information...")
+
+        with events.subscribe(
+            EventType.Venv.CREATING, on_venv_creating
+        ), events.subscribe(EventType.Venv.RETRIEVING, on_venv_retrieving):
+            try:
+                env_info = manager.create_environment(
+                    venv_path, rebuild=rebuild
+                )
+            except (OSError, ValueError, RuntimeError) as e:
+                raise VenvError(str(e)) from e
+
+        system_info = env_info["system"]
+        project_name = env_info["project"]["name"]
+        python_version = system_info["python"]["version"] or "Unknown"
+        pip_version = system_info["pip"]["version"] or "Unknown"
+
+        # Create panel content using Text class
+        content = (
+            Text()
+            .append_field(
+                "Virtual Environment",
+                project_name,
+                note=venv_path.name,
+                value_style=StyleType.ENV_PROJECT_NAME,
+                note_style=StyleType.ENV_VENV_NAME,
+            )
+            .append_field(
+                "Python Version",
+                python_version,
+                value_style=StyleType.ENV_VERSION,
+            )
+            .append_field(
+                "Pip Version",
+                pip_version,
+                value_style=StyleType.ENV_VERSION,
+            )
+            .append_field(
+                "Location",
+                str(venv_path),
+                value_style=StyleType.ENV_PATH,
+            )
+            .append_field(
+                "Status",
+                f"{SymbolType.SUCCESS} Created",
+                value_style=StyleType.SUCCESS,
+                add_line_after=False,
+            )
+        )
+
+        # Display the panel
+        display_panel("Environment Created", content)
+
+        # Install requirements if they exist, reusing the same status
+        if env_info.get("deps_source"):
+            status.update("Installing dependencies...")
+
+            # 限制狀態更新頻率，避免大量套件時頻繁重繪
+            last_update = [0.0]
+
+            def on_package_installing(pkg_name: str, **kwargs):
+                total_packages = kwargs.get("total_packages")
+                current_index = kwargs.get("current_index")
+                now = time.monotonic()
+                if (
+                    now - last_update[0] < 0.1
+                    and current_index != total_packages
+                ):
+                    return
+                last_update[0] = now
+
+                # 從 kwargs 取得額外資訊並格式化顯示訊息
+                extras = kwargs.get("extras")
+                version = kwargs.get("version")
+                parts = [
+                    f"Installing dependencies... ({current_index}/{total_packages})\n",
+                    f"[dim]Installing {pkg_name}",
+                ]
+                if extras:
+                    parts.append(f"[{','.join(sorted(extras))}]")
+                if version:
+                    parts.append(f"{kwargs.get('constraint') or '=='}{version}")
+                parts.append("...[/dim]")
+
+                # 更新狀態顯示
+                status.update("".join(parts))
+
+            # 註冊事件監聽，安裝完成後自動移除
+            with events.subscribe(
+                EventType.Package.INSTALLING, on_package_installing
+            ):
+                try:
+                    manager.install_requirements(venv_path)
+                except RuntimeError as e:
+                    raise VenvError(str(e)) from e
+            print_success("Virtual environment created successfully")
+            console.print()
+
+    # Show activation tip
+    print_tips("Use [cyan]pm on[/cyan] to activate the environment")
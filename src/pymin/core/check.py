@@ -1,6 +1,5 @@
 # Package name validation service with PyPI availability checking and security analysis
 import re
-import requests
 from typing import List, Dict, Optional, Tuple
 from packaging.utils import canonicalize_name
 from rich.console import Console
@@ -40,6 +39,9 @@ class PackageNameChecker:
         if self._popular_packages_cache is not None:
             return self._popular_packages_cache
 
+        # 只在實際查詢時才載入 requests，縮短 CLI 啟動時間
+        import requests
+
         with Live(Text(), refresh_per_second=10, console=console) as live:
             try:
                 live.update(
@@ -86,6 +88,8 @@ class PackageNameChecker:
         result["is_valid"] = True
 
         # Check availability
+        import requests
+
         response = requests.get(f"{self.PYPI_URL}/{name}/json")
         if response.status_code == 404:
             result["is_available"] = True
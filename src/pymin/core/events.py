@@ -1,7 +1,8 @@
 """Event system for package management"""
 
-from typing import Dict, Set, Callable, Any
+from typing import Dict, Callable, Any, Iterator
 from threading import Lock
+from contextlib import contextmanager
 
 
 class EventType:
@@ -37,7 +38,8 @@ class EventSystem:
 
     _instance = None
     _lock = Lock()
-    _listeners: Dict[str, Set[Callable]] = {}
+    # 以 dict 保存監聽器：保留註冊順序且移除為 O(1)
+    _listeners: Dict[str, Dict[Callable, None]] = {}
 
     def __new__(cls):
         """Ensure singleton pattern"""
@@ -48,17 +50,19 @@ class EventSystem:
                     cls._instance._listeners = {}
         return cls._instance
 
-    def on(self, event: str, callback: Callable) -> None:
+    def on(self, event: str, callback: Callable) -> Callable[[], None]:
         """Register an event listener
 
         Args:
             event: Event name to listen for
             callback: Function to call when event occurs
+
+        Returns:
+            Function that removes this listener when called
         """
         with self._lock:
-            if event not in self._listeners:
-                self._listeners[event] = set()
-            self._listeners[event].add(callback)
+            self._listeners.setdefault(event, {})[callback] = None
+        return lambda: self.off(event, callback)
 
     def off(self, event: str, callback: Callable) -> None:
         """Remove an event listener
@@ -68,8 +72,25 @@ class EventSystem:
             callback: Function to remove
         """
         with self._lock:
-            if event in self._listeners and callback in self._listeners[event]:
-                self._listeners[event].remove(callback)
+            self._listeners.get(event, {}).pop(callback, None)
+
+    @contextmanager
+    def subscribe(self, event: str, callback: Callable) -> Iterator[Callable]:
+        """Register an event listener for the duration of a with block
+
+        Args:
+            event: Event name to listen for
+            callback: Function to call when event occurs
+
+        Example:
+            with events.subscribe(EventType.Venv.CREATING, on_creating):
+                manager.create_environment(venv_path)
+        """
+        unsubscribe = self.on(event, callback)
+        try:
+            yield callback
+        finally:
+            unsubscribe()
 
     def emit(self, event: str, *args: Any, **kwargs: Any) -> None:
         """Emit an event
@@ -1,11 +1,28 @@
+import os
+import re
 import sys
-from typing import Any, Set, Dict, Optional, List, Tuple
+import hashlib
+import json
+from typing import (
+    Any,
+    Set,
+    FrozenSet,
+    Dict,
+    Optional,
+    List,
+    Tuple,
+    NamedTuple,
+    Iterable,
+)
 from packaging.requirements import Requirement
 from packaging.version import Version, parse as parse_version
 from packaging.utils import canonicalize_name
 import importlib.metadata
 from enum import Enum
-import tomlkit
+from functools import lru_cache
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+import tomllib
 from pathlib import Path
 from rich.text import Text
 
@@ -14,10 +31,31 @@ from .version_utils import (
     check_version_compatibility,
     parse_requirement_string,
     validate_version,
-    VALID_CONSTRAINTS,
+    CONSTRAINT_PREFIX_PATTERN,
 )
 
 
+def normalize_package_id(name: str) -> str:
+    """Normalize a package name, interned for fast dict/set lookups"""
+    # 同一 ID 會出現在多個快取中，intern 後比對可直接以 identity 判斷
+    return sys.intern(canonicalize_name(name))
+
+
+@lru_cache(maxsize=4096)
+def parse_requirement(requirement: str) -> Tuple[str, str]:
+    """
+    Parse a requirement string into name and specifier, cached
+
+    Args:
+        requirement: PEP 508 requirement string
+
+    Returns:
+        Tuple of (name, specifier), specifier is empty if unpinned
+    """
+    req = Requirement(requirement)
+    return req.name, str(req.specifier) if req.specifier else ""
+
+
 class PackageStatus(str, Enum):
     """
     Package status enumeration
@@ -103,19 +141,33 @@ class DependencyInfo:
     Stores both original name and normalized id for package identification
     """
 
+    # 每個相依套件一個實例，使用 slots 減少記憶體並加快屬性存取
+    __slots__ = (
+        "name",
+        "id",
+        "_version_spec",
+        "_source",
+        "versions",
+        "extras",
+        "_formatted",
+    )
+
     def __init__(self, name: str, version_spec: str, source: DependencySource):
         self.name = name  # Original name (preserves case)
-        self.id = canonicalize_name(
+        self.id = normalize_package_id(
             name
         )  # Normalized ID (for comparison and lookup)
         self._version_spec = version_spec
-        self.source = source
+        self._source = source
         self.versions: Dict[DependencySource, str] = {}
         self.extras: Optional[Set[str]] = None
+        # format_version 的結果，版本或來源變動時清除
+        self._formatted: Optional[Text] = None
 
     def set_version(self, version: str, source: DependencySource):
         """Set version for specific source"""
         self.versions[source] = version
+        self._formatted = None
 
     @property
     def version_spec(self) -> str:
@@ -125,6 +177,17 @@ class DependencyInfo:
     @version_spec.setter
     def version_spec(self, value: str):
         self._version_spec = value
+        self._formatted = None
+
+    @property
+    def source(self) -> DependencySource:
+        """Get the files this dependency is declared in"""
+        return self._source
+
+    @source.setter
+    def source(self, value: DependencySource):
+        self._source = value
+        self._formatted = None
 
     @property
     def full_spec(self) -> str:
@@ -168,10 +231,7 @@ class DependencyInfo:
     ) -> Text:
         """Format version with colored source tag"""
         # 統一移除版本約束，只保留版本號
-        for constraint in VALID_CONSTRAINTS:
-            if version.startswith(constraint):
-                version = version[len(constraint) :].strip()
-                break
+        version = self._clean_version(version)
 
         # Create a Text object for proper color formatting
         text = Text()
@@ -182,7 +242,13 @@ class DependencyInfo:
         return text
 
     def format_version(self) -> Text:
-        """Format version with source indicator"""
+        """Format version with source indicator, cached until changed"""
+        if self._formatted is None:
+            self._formatted = self._build_formatted_version()
+        return self._formatted
+
+    def _build_formatted_version(self) -> Text:
+        """Build the formatted version text"""
         if self.source == DependencySource.BOTH:
             # 先清理版本號
             p_version = self._clean_version(
@@ -225,11 +291,100 @@ class DependencyInfo:
         """Clean version string by removing constraints"""
         if version is None:
             return ""
-        for constraint in VALID_CONSTRAINTS:
-            if version.startswith(constraint):
-                return version[len(constraint) :].strip()
+        match = CONSTRAINT_PREFIX_PATTERN.match(version)
+        if match:
+            return version[match.end() :].strip()
         return version
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dict"""
+        return {
+            "name": self.name,
+            "version_spec": self._version_spec,
+            "source": self.source.value,
+            "versions": {
+                source.value: version
+                for source, version in self.versions.items()
+            },
+            "extras": sorted(self.extras) if self.extras else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DependencyInfo":
+        """Rebuild from a dict created by to_dict"""
+        dep_info = cls(
+            name=data["name"],
+            version_spec=data["version_spec"],
+            source=DependencySource(data["source"]),
+        )
+        for source, version in data["versions"].items():
+            dep_info.set_version(version, DependencySource(source))
+        if data["extras"]:
+            dep_info.extras = set(data["extras"])
+        return dep_info
+
+
+# Known system packages that should be excluded from analysis
+SYSTEM_PACKAGES = frozenset(
+    {
+        "pip",
+        "setuptools",
+        "wheel",
+        "pkg_resources",  # Part of setuptools
+        "pkg-resources",  # Debian/Ubuntu specific
+        "distribute",  # Old version of setuptools
+        "easy_install",  # Part of setuptools
+    }
+)
+
+# Extras that only carry development dependencies
+EXCLUDED_EXTRAS = frozenset(
+    {
+        "development",
+        "dev",
+        "test",
+        "testing",
+        "doc",
+        "docs",
+        "documentation",
+        "lint",
+        "linting",
+        "typing",
+        "check",
+    }
+)
+
+# Environment markers checked when collecting runtime dependencies
+EXTRA_MARKER_PATTERN = re.compile(r"extra\s*==\s*['\"]([^'\"]+)['\"]")
+PLATFORM_MARKER_PATTERN = re.compile(r"sys_platform\s*==\s*['\"]([^'\"]+)['\"]")
+
+# site-packages paths already ensured on sys.path
+_added_site_packages: Set[str] = set()
+
+
+@lru_cache(maxsize=None)
+def _patch_path_distribution() -> None:
+    """Setup importlib.metadata PathDistribution.at, once per process"""
+    importlib.metadata.PathDistribution.at = (
+        lambda path: importlib.metadata.PathDistribution(path)
+    )
+
+
+# 跨 PackageAnalyzer 實例共用的解析結果，以檔案狀態為鍵
+_scan_cache: Dict[Tuple, Dict[str, Dict]] = {}
+_requirements_memo: Dict[Tuple, Dict[str, DependencyInfo]] = {}
+_cache_lock = Lock()
+
+RequirementsCacheKey = Tuple[Optional[Tuple[str, int, int]], ...]
+
+
+class PackageSnapshot(NamedTuple):
+    """Package analysis results collected from a single scan"""
+
+    installed: Dict[str, Dict]
+    top_level: Dict[str, Dict]
+    requirements: Dict[str, DependencyInfo]
+
 
 class PackageAnalyzer:
     """
@@ -255,16 +410,28 @@ class PackageAnalyzer:
             self.site_packages = self.venv_analyzer.site_packages
 
             # Add site-packages to sys.path if not present
-            if str(self.site_packages) not in sys.path:
-                sys.path.insert(0, str(self.site_packages))
+            # 已處理過的路徑直接略過，避免每次建立實例都線性搜尋 sys.path
+            site_packages = str(self.site_packages)
+            if site_packages not in _added_site_packages:
+                if site_packages not in sys.path:
+                    sys.path.insert(0, site_packages)
+                _added_site_packages.add(site_packages)
 
             # Setup importlib.metadata for compatibility
-            importlib.metadata.PathDistribution.at = (
-                lambda path: importlib.metadata.PathDistribution(path)
-            )
+            _patch_path_distribution()
 
         self._packages_cache = None
         self._requirements_cache = None
+        self._snapshot_cache = None
+        self._all_deps_cache = None
+        # 依賴檔案中各套件宣告的版本索引及其建立時的檔案狀態
+        self._declared_versions_cache: Optional[
+            Tuple[
+                RequirementsCacheKey,
+                Dict[str, List[str]],
+                Dict[str, List[str]],
+            ]
+        ] = None
 
     def determine_config_source(self) -> Tuple[bool, str]:
         """
@@ -300,6 +467,30 @@ class PackageAnalyzer:
         """Clear the package and requirements cache"""
         self._packages_cache = None
         self._requirements_cache = None
+        self._snapshot_cache = None
+        self._all_deps_cache = None
+        self._declared_versions_cache = None
+        with _cache_lock:
+            _scan_cache.clear()
+            _requirements_memo.clear()
+
+    def analyze_all(self) -> PackageSnapshot:
+        """
+        Get installed, top-level and required packages in one call
+
+        The site-packages scan and requirement parsing are shared by all
+        three views, and the result is cached until clear_cache() is called.
+
+        Returns:
+            PackageSnapshot with installed, top_level and requirements
+        """
+        if self._snapshot_cache is None:
+            self._snapshot_cache = PackageSnapshot(
+                installed=self.get_installed_packages(),
+                top_level=self.get_top_level_packages(),
+                requirements=self._parse_requirements(),
+            )
+        return self._snapshot_cache
 
     def _parse_requirements(self) -> Dict[str, DependencyInfo]:
         """
@@ -309,63 +500,75 @@ class PackageAnalyzer:
         Returns:
             Dictionary mapping package IDs to DependencyInfo objects
         """
+        cache_key = None
+        if self._requirements_cache is None:
+            # 檔案未變動時直接使用記憶體或磁碟快取，略過解析
+            cache_key = self._requirements_cache_key()
+            memo_key = (self.project_path, cache_key)
+            with _cache_lock:
+                self._requirements_cache = _requirements_memo.get(memo_key)
+            if self._requirements_cache is None:
+                self._requirements_cache = self._load_requirements_cache(
+                    cache_key
+                )
+                if self._requirements_cache is not None:
+                    with _cache_lock:
+                        _requirements_memo[memo_key] = self._requirements_cache
+
         if self._requirements_cache is None:
             self._requirements_cache = {}
             sources: Dict[str, Set[DependencySource]] = {}
+            has_errors = False
 
             # Parse requirements.txt
             req_file = self.project_path / "requirements.txt"
             if req_file.exists():
-                with open(req_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#"):
-                            try:
-                                name, extras, constraint, version = (
-                                    parse_requirement_string(line)
-                                )
-                                if name is None:
-                                    continue
-
-                                pkg_id = canonicalize_name(name)
-                                spec = (
-                                    f"{constraint}{version}"
-                                    if constraint and version
-                                    else ""
-                                )
+                for line in self._read_requirement_lines(req_file):
+                    try:
+                        name, extras, constraint, version = (
+                            parse_requirement_string(line)
+                        )
+                        if name is None:
+                            continue
 
-                                # 總是使用最新的名稱和版本
-                                dep_info = DependencyInfo(
-                                    name=name,
-                                    version_spec=spec,
-                                    source=DependencySource.REQUIREMENTS,
-                                )
-                                if extras:
-                                    dep_info.extras = extras
+                        pkg_id = normalize_package_id(name)
+                        spec = (
+                            f"{constraint}{version}"
+                            if constraint and version
+                            else ""
+                        )
 
-                                # 更新或添加新的套件資訊
-                                self._requirements_cache[pkg_id] = dep_info
-                                if pkg_id not in sources:
-                                    sources[pkg_id] = set()
-                                sources[pkg_id].add(
-                                    DependencySource.REQUIREMENTS
-                                )
-                                dep_info.set_version(
-                                    spec, DependencySource.REQUIREMENTS
-                                )
+                        # 總是使用最新的名稱和版本
+                        dep_info = DependencyInfo(
+                            name=name,
+                            version_spec=spec,
+                            source=DependencySource.REQUIREMENTS,
+                        )
+                        if extras:
+                            dep_info.extras = extras
+
+                        # 更新或添加新的套件資訊
+                        self._requirements_cache[pkg_id] = dep_info
+                        if pkg_id not in sources:
+                            sources[pkg_id] = set()
+                        sources[pkg_id].add(DependencySource.REQUIREMENTS)
+                        dep_info.set_version(
+                            spec, DependencySource.REQUIREMENTS
+                        )
 
-                            except Exception as e:
-                                print(
-                                    f"Warning: Error processing requirement {line}: {e}"
-                                )
-                                continue
+                    except Exception as e:
+                        print(
+                            f"Warning: Error processing requirement {line}: {e}"
+                        )
+                        has_errors = True
+                        continue
 
             # Parse pyproject.toml
             pyproject_file = self.project_path / "pyproject.toml"
             if pyproject_file.exists():
                 try:
-                    with open(pyproject_file, "r", encoding="utf-8") as f:
-                        pyproject_data = tomlkit.load(f)
+                    with open(pyproject_file, "rb") as f:
+                        pyproject_data = tomllib.load(f)
 
                     if (
                         "project" in pyproject_data
@@ -379,7 +582,7 @@ class PackageAnalyzer:
                                 if name is None:
                                     continue
 
-                                pkg_id = canonicalize_name(name)
+                                pkg_id = normalize_package_id(name)
                                 spec = (
                                     f"{constraint}{version}"
                                     if constraint and version
@@ -411,9 +614,11 @@ class PackageAnalyzer:
                                 print(
                                     f"Warning: Error processing dependency {dep}: {e}"
                                 )
+                                has_errors = True
                                 continue
                 except Exception as e:
                     print(f"Warning: Error reading pyproject.toml: {e}")
+                    has_errors = True
 
             # Update sources for packages that appear in both files
             for pkg_id, src_set in sources.items():
@@ -422,8 +627,191 @@ class PackageAnalyzer:
                         DependencySource.combine(src_set)
                     )
 
+            # 解析有警告時不寫入快取，讓下次執行仍能顯示警告
+            if not has_errors:
+                with _cache_lock:
+                    _requirements_memo[(self.project_path, cache_key)] = (
+                        self._requirements_cache
+                    )
+                self._save_requirements_cache(cache_key)
+
         return self._requirements_cache
 
+    def _requirements_cache_path(self) -> Path:
+        """Get the on-disk cache file for this project's requirements"""
+        digest = hashlib.sha1(
+            str(self.project_path.resolve()).encode("utf-8")
+        ).hexdigest()
+        return (
+            Path.home() / ".cache" / "pymin" / "requirements" / f"{digest}.json"
+        )
+
+    def _requirements_cache_key(self) -> RequirementsCacheKey:
+        """
+        Build cache key from the stat of requirements.txt and pyproject.toml
+
+        Returns:
+            Tuple of (name, st_mtime_ns, st_size) per file, None if missing
+        """
+        key = []
+        for filename in ("requirements.txt", "pyproject.toml"):
+            try:
+                stat = (self.project_path / filename).stat()
+                key.append((filename, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def _load_requirements_cache(
+        self, cache_key: Optional[RequirementsCacheKey]
+    ) -> Optional[Dict[str, DependencyInfo]]:
+        """
+        Load parsed requirements from disk if the input files are unchanged
+
+        Args:
+            cache_key: Key built by _requirements_cache_key
+
+        Returns:
+            Dictionary mapping package IDs to DependencyInfo, or None on miss
+        """
+        if cache_key is None:
+            return None
+        try:
+            with open(self._requirements_cache_path(), encoding="utf-8") as f:
+                cache = json.load(f)
+            stored_key = tuple(tuple(k) if k else None for k in cache["key"])
+            if stored_key != cache_key:
+                return None
+            return {
+                sys.intern(pkg_id): DependencyInfo.from_dict(data)
+                for pkg_id, data in cache["requirements"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_requirements_cache(
+        self, cache_key: Optional[RequirementsCacheKey]
+    ) -> None:
+        """
+        Save parsed requirements to disk, ignoring write failures
+
+        Args:
+            cache_key: Key built by _requirements_cache_key
+        """
+        if cache_key is None:
+            return
+        cache_file = self._requirements_cache_path()
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "key": cache_key,
+                        "requirements": {
+                            pkg_id: dep_info.to_dict()
+                            for pkg_id, dep_info in self._requirements_cache.items()
+                        },
+                    },
+                    f,
+                )
+            # 以替換方式寫入，其他程序不會讀到寫到一半的快取
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    def _distributions_cache_path(self) -> Path:
+        """Get the on-disk cache file for this environment's distributions"""
+        digest = hashlib.sha1(
+            str(self.site_packages.resolve()).encode("utf-8")
+        ).hexdigest()
+        return (
+            Path.home()
+            / ".cache"
+            / "pymin"
+            / "distributions"
+            / f"{digest}.json"
+        )
+
+    def _load_distributions_cache(
+        self, exclude_system: bool
+    ) -> Dict[str, Tuple[int, Optional[Dict]]]:
+        """
+        Load per-directory distribution metadata saved by a previous scan
+
+        Args:
+            exclude_system: Whether system packages are excluded
+
+        Returns:
+            Dict mapping metadata directory names to (st_mtime_ns, package
+            information or None if excluded); empty on miss
+        """
+        try:
+            with open(self._distributions_cache_path(), encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache["exclude_system"] != exclude_system:
+                return {}
+            return {
+                dir_name: (
+                    mtime_ns,
+                    pkg_info
+                    and {
+                        "name": pkg_info["name"],
+                        "id": sys.intern(pkg_info["id"]),
+                        "installed_version": pkg_info["installed_version"],
+                        "dependencies": [
+                            sys.intern(dep) for dep in pkg_info["dependencies"]
+                        ],
+                    },
+                )
+                for dir_name, (mtime_ns, pkg_info) in cache["entries"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _save_distributions_cache(
+        self,
+        exclude_system: bool,
+        entries: Dict[str, Tuple[int, Optional[Dict]]],
+    ) -> None:
+        """
+        Save per-directory distribution metadata, ignoring write failures
+
+        Args:
+            exclude_system: Whether system packages are excluded
+            entries: Dict mapping metadata directory names to (st_mtime_ns,
+                package information or None if excluded)
+        """
+        cache_file = self._distributions_cache_path()
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"exclude_system": exclude_system, "entries": entries}, f
+                )
+            # 以替換方式寫入，其他程序不會讀到寫到一半的快取
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _read_requirement_lines(req_file: Path) -> List[str]:
+        """
+        Read requirements.txt in one pass, skipping blank and comment lines
+
+        Args:
+            req_file: Path to requirements.txt
+
+        Returns:
+            List of stripped requirement lines
+        """
+        return [
+            line
+            for line in map(str.strip, req_file.read_text("utf-8").splitlines())
+            if line and not line.startswith("#")
+        ]
+
     def _parse_pyproject_dependencies(self) -> List[DependencyInfo]:
         """
         Parse dependencies from pyproject.toml
@@ -436,8 +824,8 @@ class PackageAnalyzer:
 
         if pyproject_file.exists():
             try:
-                with open(pyproject_file, "r", encoding="utf-8") as f:
-                    pyproject_data = tomlkit.load(f)
+                with open(pyproject_file, "rb") as f:
+                    pyproject_data = tomllib.load(f)
 
                 if (
                     "project" in pyproject_data
@@ -445,9 +833,8 @@ class PackageAnalyzer:
                 ):
                     for dep in pyproject_data["project"]["dependencies"]:
                         try:
-                            req = Requirement(dep)
-                            name = canonicalize_name(req.name)
-                            spec = str(req.specifier) if req.specifier else ""
+                            req_name, spec = parse_requirement(dep)
+                            name = canonicalize_name(req_name)
                             dependencies.append(
                                 DependencyInfo(
                                     name=name,
@@ -478,19 +865,11 @@ class PackageAnalyzer:
         return check_version_compatibility(installed_version, required_spec)
 
     @staticmethod
-    def _get_system_packages() -> Set[str]:
+    def _get_system_packages() -> FrozenSet[str]:
         """
         Get a set of known system packages that should be excluded from analysis
         """
-        return {
-            "pip",
-            "setuptools",
-            "wheel",
-            "pkg_resources",  # Part of setuptools
-            "pkg-resources",  # Debian/Ubuntu specific
-            "distribute",  # Old version of setuptools
-            "easy_install",  # Part of setuptools
-        }
+        return SYSTEM_PACKAGES
 
     def _should_exclude_dependency(self, requirement: str) -> bool:
         """
@@ -506,37 +885,82 @@ class PackageAnalyzer:
             return False
 
         _, conditions = requirement.split(";", 1)
-        conditions = "".join(conditions.split())
-
-        if "extra==" in conditions:
-            extra_name = conditions.split("extra==")[1].strip("'").strip('"')
-            exclude_extras = {
-                "development",
-                "dev",
-                "test",
-                "testing",
-                "doc",
-                "docs",
-                "documentation",
-                "lint",
-                "linting",
-                "typing",
-                "check",
-            }
-            if extra_name in exclude_extras:
-                return True
 
-        if "sys_platform==" in conditions:
-            import sys
+        extra_match = EXTRA_MARKER_PATTERN.search(conditions)
+        if extra_match and extra_match.group(1) in EXCLUDED_EXTRAS:
+            return True
 
-            platform_name = (
-                conditions.split("sys_platform==")[1].strip("'").strip('"')
-            )
-            if sys.platform != platform_name:
-                return True
+        platform_match = PLATFORM_MARKER_PATTERN.search(conditions)
+        if platform_match and platform_match.group(1) != sys.platform:
+            return True
 
         return False
 
+    def _get_declared_versions(
+        self,
+    ) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Index the versions declared for each package in the dependency files
+
+        Both files are parsed once and reused until their stat changes, so
+        looking up one package no longer rescans every line.
+
+        Returns:
+            Tuple of (requirements.txt index, pyproject.toml index), each
+            mapping package IDs to version strings in file order
+        """
+        cache_key = self._requirements_cache_key()
+        if (
+            self._declared_versions_cache is not None
+            and self._declared_versions_cache[0] == cache_key
+        ):
+            return self._declared_versions_cache[1:]
+
+        def index(specs: Iterable[str]) -> Dict[str, List[str]]:
+            versions = {}
+            for spec in specs:
+                try:
+                    name, _, constraint, version = parse_requirement_string(
+                        spec
+                    )
+                except Exception:
+                    continue
+                if name:
+                    versions.setdefault(canonicalize_name(name), []).append(
+                        f"{constraint}{version}"
+                        if constraint and version
+                        else ""
+                    )
+            return versions
+
+        req_versions = {}
+        req_file = self.project_path / "requirements.txt"
+        if req_file.exists():
+            req_versions = index(self._read_requirement_lines(req_file))
+
+        pyproject_versions = {}
+        pyproject_file = self.project_path / "pyproject.toml"
+        if pyproject_file.exists():
+            try:
+                with open(pyproject_file, "rb") as f:
+                    pyproject_data = tomllib.load(f)
+                if (
+                    "project" in pyproject_data
+                    and "dependencies" in pyproject_data["project"]
+                ):
+                    pyproject_versions = index(
+                        pyproject_data["project"]["dependencies"]
+                    )
+            except Exception:
+                pass
+
+        self._declared_versions_cache = (
+            cache_key,
+            req_versions,
+            pyproject_versions,
+        )
+        return req_versions, pyproject_versions
+
     def _get_package_info(
         self,
         pkg_id: str,
@@ -565,67 +989,14 @@ class PackageAnalyzer:
 
         is_installed = pkg_id in installed_packages
 
-        # 檢查是否有重複定義
+        # 檢查是否有重複定義，先看 requirements.txt 再看 pyproject.toml
         duplicates = []
         if dep_info:
-            # 檢查 requirements.txt
-            req_file = self.project_path / "requirements.txt"
-            if req_file.exists():
-                versions = []
-                with open(req_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#"):
-                            try:
-                                name, _, constraint, version = (
-                                    parse_requirement_string(line)
-                                )
-                                if name and canonicalize_name(name) == pkg_id:
-                                    versions.append(
-                                        f"{constraint}{version}"
-                                        if constraint and version
-                                        else ""
-                                    )
-                            except Exception:
-                                continue
+            for declared in self._get_declared_versions():
+                versions = declared.get(pkg_id, ())
                 if len(versions) > 1:
-                    duplicates = versions
-
-            # 檢查 pyproject.toml
-            if not duplicates:  # 如果在 requirements.txt 中沒有重複
-                pyproject_file = self.project_path / "pyproject.toml"
-                if pyproject_file.exists():
-                    try:
-                        with open(pyproject_file, "r", encoding="utf-8") as f:
-                            pyproject_data = tomlkit.load(f)
-                            if (
-                                "project" in pyproject_data
-                                and "dependencies" in pyproject_data["project"]
-                            ):
-                                versions = []
-                                for dep in pyproject_data["project"][
-                                    "dependencies"
-                                ]:
-                                    try:
-                                        name, _, constraint, version = (
-                                            parse_requirement_string(dep)
-                                        )
-                                        if (
-                                            name
-                                            and canonicalize_name(name)
-                                            == pkg_id
-                                        ):
-                                            versions.append(
-                                                f"{constraint}{version}"
-                                                if constraint and version
-                                                else ""
-                                            )
-                                    except Exception:
-                                        continue
-                                if len(versions) > 1:
-                                    duplicates = versions
-                    except Exception:
-                        pass
+                    duplicates = list(versions)
+                    break
 
         # Determine package status
         statuses = set()
@@ -663,7 +1034,8 @@ class PackageAnalyzer:
             "installed_version": installed_version,
             "required_version": required_version,
             "extras": extras,
-            "dependencies": sorted(pkg_info.get("dependencies", [])),
+            # 讀取 metadata 時已排序，複製即可
+            "dependencies": list(pkg_info.get("dependencies", [])),
             "statuses": statuses,  # Return set of statuses
             "status": min(
                 statuses, key=PackageStatus.get_priority
@@ -673,13 +1045,13 @@ class PackageAnalyzer:
         }
 
     def _get_package_dependencies(
-        self, dist: importlib.metadata.PathDistribution, exclude_system: bool
+        self, requires: Optional[List[str]], exclude_system: bool
     ) -> List[str]:
         """
-        Get package dependencies from distribution
+        Get package dependencies from distribution requirements
 
         Args:
-            dist: Package distribution
+            requires: Requirement strings of the distribution
             exclude_system: Whether to exclude system packages
 
         Returns:
@@ -690,13 +1062,13 @@ class PackageAnalyzer:
         )
         deps = set()
 
-        if dist.requires:
-            for req in dist.requires:
+        if requires:
+            for req in requires:
                 try:
                     if self._should_exclude_dependency(req):
                         continue
-                    req_obj = Requirement(req)
-                    dep_name = canonicalize_name(req_obj.name)
+                    req_name, _ = parse_requirement(req)
+                    dep_name = normalize_package_id(req_name)
                     if not exclude_system or dep_name not in system_packages:
                         deps.add(dep_name)
                 except Exception as e:
@@ -711,6 +1083,93 @@ class PackageAnalyzer:
         """
         return self.venv_analyzer.get_venv_info()
 
+    def _read_distribution(
+        self, info_dir: Path, is_egg_info: bool, exclude_system: bool
+    ) -> Optional[Dict]:
+        """
+        Read name, version and dependencies of one installed distribution
+
+        Args:
+            info_dir: Path to the .dist-info or .egg-info directory
+            is_egg_info: Whether info_dir is an .egg-info directory
+            exclude_system: Whether to exclude system packages
+
+        Returns:
+            Package information, or None if excluded or unreadable
+        """
+        try:
+            dist = importlib.metadata.PathDistribution.at(info_dir)
+            # 每次存取 dist.metadata 都會重新解析 METADATA，只讀一次
+            metadata = dist.metadata
+            original_name = metadata["Name"]
+            normalized_id = normalize_package_id(original_name)
+
+            if exclude_system and normalized_id in self._get_system_packages():
+                return None
+
+            # egg-info 的依賴記錄在 requires.txt，需經由 dist.requires 讀取
+            requires = (
+                dist.requires
+                if is_egg_info
+                else metadata.get_all("Requires-Dist")
+            )
+
+            return {
+                "name": original_name,
+                "id": normalized_id,  # 添加 ID 到套件信息中
+                "installed_version": metadata["Version"],
+                "dependencies": self._get_package_dependencies(
+                    requires, exclude_system
+                ),
+            }
+        except Exception as e:
+            print(f"Warning: Error processing {info_dir}: {str(e)}")
+            return None
+
+    def read_distributions(
+        self, names: Iterable[str], exclude_system: bool = True
+    ) -> Dict[str, Dict]:
+        """
+        Read metadata of specific installed distributions without a full scan
+
+        Args:
+            names: Package names to look up
+            exclude_system: Whether to exclude system packages
+
+        Returns:
+            Dictionary mapping package IDs to name, version and dependencies;
+            packages that are not found are left out
+        """
+        if not self.has_venv:
+            return {}
+
+        wanted = {normalize_package_id(name) for name in names}
+        info_dirs = {}
+        try:
+            with os.scandir(self.site_packages) as entries:
+                # 與完整掃描相同順序，同名時以後者（egg-info）為準
+                for is_egg_info, dir_name in sorted(
+                    (entry.name.endswith(".egg-info"), entry.name)
+                    for entry in entries
+                    if entry.name.endswith((".dist-info", ".egg-info"))
+                ):
+                    # 目錄名稱格式為 {name}-{version}.dist-info
+                    dist_name = dir_name.rsplit(".", 1)[0].split("-", 1)[0]
+                    pkg_id = normalize_package_id(dist_name)
+                    if pkg_id in wanted:
+                        info_dirs[pkg_id] = (dir_name, is_egg_info)
+        except OSError:
+            return {}
+
+        packages = {}
+        for dir_name, is_egg_info in info_dirs.values():
+            pkg_info = self._read_distribution(
+                self.site_packages / dir_name, is_egg_info, exclude_system
+            )
+            if pkg_info is not None:
+                packages[pkg_info["id"]] = pkg_info
+        return packages
+
     def get_installed_packages(
         self, exclude_system: bool = True
     ) -> Dict[str, Dict]:
@@ -723,43 +1182,78 @@ class PackageAnalyzer:
         if not self.has_venv:
             return {}
 
+        scan_key = None
+        if self._packages_cache is None:
+            # site-packages 內容有增減時目錄 mtime 會改變
+            try:
+                scan_key = (
+                    self.site_packages,
+                    self.site_packages.stat().st_mtime_ns,
+                    exclude_system,
+                    self._requirements_cache_key(),
+                )
+            except OSError:
+                scan_key = None
+            with _cache_lock:
+                self._packages_cache = _scan_cache.get(scan_key)
+
         if self._packages_cache is None:
             packages_info = {}
-            system_packages = (
-                self._get_system_packages() if exclude_system else set()
-            )
 
             try:
-                for pattern in ["*.dist-info", "*.egg-info"]:
-                    for info_dir in sorted(self.site_packages.glob(pattern)):
-                        try:
-                            dist = importlib.metadata.PathDistribution.at(
-                                info_dir
-                            )
-                            original_name = dist.metadata["Name"]
-                            normalized_id = canonicalize_name(original_name)
-                            installed_version = dist.metadata["Version"]
-
-                            if (
-                                exclude_system
-                                and normalized_id in system_packages
-                            ):
-                                continue
+                # 只列出一次目錄；排序讓 dist-info 先於 egg-info，與先前逐一 glob 的順序相同
+                with os.scandir(self.site_packages) as entries:
+                    info_dirs = sorted(
+                        (
+                            entry.name.endswith(".egg-info"),
+                            entry.name,
+                            entry.stat().st_mtime_ns,
+                        )
+                        for entry in entries
+                        if entry.name.endswith((".dist-info", ".egg-info"))
+                    )
 
-                            packages_info[normalized_id] = {
-                                "name": original_name,
-                                "id": normalized_id,  # 添加 ID 到套件信息中
-                                "installed_version": installed_version,
-                                "dependencies": self._get_package_dependencies(
-                                    dist, exclude_system
+                # 各 metadata 目錄以名稱與 mtime 比對磁碟快取，安裝或移除
+                # 套件後只需讀取有變動的目錄
+                cached = self._load_distributions_cache(exclude_system)
+                entries = {}
+                missing = []
+                for is_egg_info, dir_name, mtime_ns in info_dirs:
+                    hit = cached.get(dir_name)
+                    if hit is not None and hit[0] == mtime_ns:
+                        entries[dir_name] = hit
+                    else:
+                        missing.append((is_egg_info, dir_name, mtime_ns))
+
+                if missing:
+                    # 讀取 metadata 以檔案 I/O 為主，交由執行緒並行處理
+                    with ThreadPoolExecutor(
+                        max_workers=min(32, (os.cpu_count() or 1) * 4)
+                    ) as executor:
+                        for (_, dir_name, mtime_ns), pkg_info in zip(
+                            missing,
+                            executor.map(
+                                lambda item: self._read_distribution(
+                                    self.site_packages / item[1],
+                                    item[0],
+                                    exclude_system,
                                 ),
-                            }
+                                missing,
+                            ),
+                        ):
+                            entries[dir_name] = (mtime_ns, pkg_info)
+                if missing or len(entries) != len(cached):
+                    self._save_distributions_cache(exclude_system, entries)
+
+                distributions = [
+                    entries[dir_name][1]
+                    for _, dir_name, _ in info_dirs
+                    if entries[dir_name][1] is not None
+                ]
 
-                        except Exception as e:
-                            print(
-                                f"Warning: Error processing {info_dir}: {str(e)}"
-                            )
-                            continue
+                # 依原順序合併，重複的套件仍由後處理者覆蓋
+                for pkg_info in distributions:
+                    packages_info[pkg_info["id"]] = pkg_info
 
                 all_dependencies = set()
                 for pkg_info in packages_info.values():
@@ -775,12 +1269,35 @@ class PackageAnalyzer:
                     )
 
                 self._packages_cache = dict(sorted(packages_info.items()))
+                self._all_deps_cache = all_dependencies
+                if scan_key is not None:
+                    with _cache_lock:
+                        _scan_cache[scan_key] = self._packages_cache
             except Exception as e:
                 print(f"Error scanning packages: {str(e)}")
                 self._packages_cache = {}
 
         return self._packages_cache
 
+    def _get_all_dependencies(self, installed_packages: Dict) -> Set[str]:
+        """
+        Get IDs of all direct dependencies of installed packages
+
+        Computed during the package scan and reused until clear_cache().
+
+        Args:
+            installed_packages: Dictionary of installed packages
+
+        Returns:
+            Set of dependency IDs
+        """
+        if self._all_deps_cache is None:
+            self._all_deps_cache = set()
+            for pkg_info in installed_packages.values():
+                if pkg_info["dependencies"]:
+                    self._all_deps_cache.update(pkg_info["dependencies"])
+        return self._all_deps_cache
+
     def get_top_level_packages(
         self, exclude_system: bool = True
     ) -> Dict[str, Dict]:
@@ -801,18 +1318,19 @@ class PackageAnalyzer:
         )
         requirements = self._parse_requirements()
 
-        all_dependencies = set()
-        for pkg_info in installed_packages.values():
-            if pkg_info["dependencies"]:
-                all_dependencies.update(pkg_info["dependencies"])
+        all_dependencies = self._get_all_dependencies(installed_packages)
 
         top_level_pkgs = {}
         for pkg_name in set(requirements.keys()) | (
             set(installed_packages.keys()) - all_dependencies
         ):
-            top_level_pkgs[pkg_name] = self._get_package_info(
-                pkg_name, installed_packages, requirements, all_dependencies
-            )
+            if pkg_name in installed_packages:
+                # Installed packages were already analyzed during the scan
+                top_level_pkgs[pkg_name] = dict(installed_packages[pkg_name])
+            else:
+                top_level_pkgs[pkg_name] = self._get_package_info(
+                    pkg_name, installed_packages, requirements, all_dependencies
+                )
 
         return dict(sorted(top_level_pkgs.items()))
 
@@ -837,10 +1355,10 @@ class PackageAnalyzer:
         requirements = self._parse_requirements()
         top_level = self.get_top_level_packages(exclude_system=exclude_system)
 
-        all_dependencies = set()
-        for pkg_info in installed_packages.values():
-            if pkg_info["dependencies"]:
-                all_dependencies.update(pkg_info["dependencies"])
+        all_dependencies = self._get_all_dependencies(installed_packages)
+
+        # 同一套件可能在樹中出現多次，狀態與版本資訊只計算一次
+        package_infos: Dict[str, Dict] = {}
 
         def _build_dependency_info(
             pkg_name: str, visited: Set[str] = None
@@ -853,13 +1371,16 @@ class PackageAnalyzer:
 
             visited.add(pkg_name)
 
-            base_info = self._get_package_info(
-                pkg_name, installed_packages, requirements, all_dependencies
-            )
+            if pkg_name not in package_infos:
+                package_infos[pkg_name] = self._get_package_info(
+                    pkg_name, installed_packages, requirements, all_dependencies
+                )
+            # 淺複製，讓每個節點能各自替換 dependencies
+            base_info = dict(package_infos[pkg_name])
 
             nested_deps = {}
             for dep_name in base_info["dependencies"]:
-                dep_info = _build_dependency_info(dep_name, visited.copy())
+                dep_info = _build_dependency_info(dep_name, visited)
                 if dep_info is not None:
                     if (
                         dep_info["installed_version"] is not None
@@ -867,6 +1388,8 @@ class PackageAnalyzer:
                     ):
                         nested_deps[dep_name] = dep_info
 
+            # 離開節點時移除，visited 只記錄目前路徑上的套件
+            visited.discard(pkg_name)
             base_info["dependencies"] = nested_deps
             return base_info
 
@@ -878,6 +1401,55 @@ class PackageAnalyzer:
 
         return dict(sorted(result.items()))
 
+    @staticmethod
+    def _collect_dependency_ids(installed_packages: Dict) -> Set[str]:
+        """
+        Collect normalized IDs of all dependencies and their sub-dependencies
+
+        Args:
+            installed_packages: Dictionary of installed packages
+
+        Returns:
+            Set of normalized dependency IDs
+        """
+        all_dependencies_ids = set()
+        for pkg_info in installed_packages.values():
+            deps = pkg_info.get("dependencies", [])
+            # 標準化所有依賴的 ID
+            deps_ids = {canonicalize_name(dep) for dep in deps}
+            all_dependencies_ids.update(deps_ids)
+            # 遞迴收集子依賴的依賴
+            for dep in deps:
+                dep_id = canonicalize_name(dep)
+                if dep_id in installed_packages:
+                    subdeps = installed_packages[dep_id].get("dependencies", [])
+                    all_dependencies_ids.update(
+                        canonicalize_name(subdep) for subdep in subdeps
+                    )
+        return all_dependencies_ids
+
+    @staticmethod
+    def _get_version_for_check(
+        dep_info: DependencyInfo, use_pyproject: bool
+    ) -> str:
+        """
+        Get the version specification to check against the installed version
+
+        Args:
+            dep_info: Dependency information
+            use_pyproject: Whether using pyproject.toml as source
+
+        Returns:
+            Version specification, or empty string if none
+        """
+        if use_pyproject:
+            # 如果使用 pyproject.toml，優先使用其版本規範，沒有時才使用 requirements.txt 的版本
+            return dep_info.versions.get(
+                DependencySource.PYPROJECT, ""
+            ) or dep_info.versions.get(DependencySource.REQUIREMENTS, "")
+        # 如果使用 requirements.txt，使用其版本規範
+        return dep_info.versions.get(DependencySource.REQUIREMENTS, "")
+
     def get_package_inconsistencies(
         self,
         installed_packages: Dict,
@@ -903,6 +1475,21 @@ class PackageAnalyzer:
             PackageStatus.DUPLICATE: [],  # 新增重複套件的列表
         }
 
+        # 沒有任何需求定義時，只會有不在 requirements 中的套件，直接略過其他檢查
+        if not requirements:
+            all_dependencies_ids = self._collect_dependency_ids(
+                installed_packages
+            )
+            inconsistencies[PackageStatus.NOT_IN_REQUIREMENTS] = sorted(
+                (
+                    pkg_info.get("name", pkg_id)
+                    for pkg_id, pkg_info in installed_packages.items()
+                    if canonicalize_name(pkg_id) not in all_dependencies_ids
+                ),
+                key=str.lower,
+            )
+            return inconsistencies
+
         # 追蹤套件在每個文件中的出現次數
         req_duplicates: Dict[str, List[str]] = {}  # pkg_id -> [versions]
         proj_duplicates: Dict[str, List[str]] = {}  # pkg_id -> [versions]
@@ -910,33 +1497,30 @@ class PackageAnalyzer:
         # Parse requirements.txt
         req_file = self.project_path / "requirements.txt"
         if req_file.exists():
-            with open(req_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        try:
-                            name, extras, constraint, version = (
-                                parse_requirement_string(line)
-                            )
-                            if name is None:
-                                continue
-                            pkg_id = canonicalize_name(name)
-                            if pkg_id not in req_duplicates:
-                                req_duplicates[pkg_id] = []
-                            req_duplicates[pkg_id].append(
-                                f"{constraint}{version}"
-                                if constraint and version
-                                else ""
-                            )
-                        except Exception:
-                            continue
+            for line in self._read_requirement_lines(req_file):
+                try:
+                    name, extras, constraint, version = (
+                        parse_requirement_string(line)
+                    )
+                    if name is None:
+                        continue
+                    pkg_id = canonicalize_name(name)
+                    if pkg_id not in req_duplicates:
+                        req_duplicates[pkg_id] = []
+                    req_duplicates[pkg_id].append(
+                        f"{constraint}{version}"
+                        if constraint and version
+                        else ""
+                    )
+                except Exception:
+                    continue
 
         # Parse pyproject.toml
         pyproject_file = self.project_path / "pyproject.toml"
         if pyproject_file.exists():
             try:
-                with open(pyproject_file, "r", encoding="utf-8") as f:
-                    pyproject_data = tomlkit.load(f)
+                with open(pyproject_file, "rb") as f:
+                    pyproject_data = tomllib.load(f)
                     if (
                         "project" in pyproject_data
                         and "dependencies" in pyproject_data["project"]
@@ -990,20 +1574,40 @@ class PackageAnalyzer:
                             ].append((dep_info.name, final_version))
 
         # 收集所有依賴關係（包含子依賴和孫依賴），使用標準化的 ID
-        all_dependencies_ids = set()
-        for pkg_info in installed_packages.values():
-            deps = pkg_info.get("dependencies", [])
-            # 標準化所有依賴的 ID
-            deps_ids = {canonicalize_name(dep) for dep in deps}
-            all_dependencies_ids.update(deps_ids)
-            # 遞迴收集子依賴的依賴
-            for dep in deps:
-                dep_id = canonicalize_name(dep)
-                if dep_id in installed_packages:
-                    subdeps = installed_packages[dep_id].get("dependencies", [])
-                    all_dependencies_ids.update(
-                        canonicalize_name(subdep) for subdep in subdeps
-                    )
+        all_dependencies_ids = self._collect_dependency_ids(installed_packages)
+        listed_ids = {
+            canonicalize_name(req.name) for req in requirements.values()
+        }
+
+        # 版本相容性只檢查一次，結果供下方的快速回傳與逐項檢查共用
+        version_mismatches = {}  # pkg_id -> version_for_check
+        for pkg_id, dep_info in requirements.items():
+            normalized_id = canonicalize_name(dep_info.name)
+            # 跳過未安裝及已經處理過的重複定義套件
+            if (
+                normalized_id in duplicates
+                or normalized_id not in installed_packages
+            ):
+                continue
+            version_for_check = self._get_version_for_check(
+                dep_info, use_pyproject
+            )
+            if version_for_check and not self._check_version_compatibility(
+                installed_packages[normalized_id]["installed_version"],
+                version_for_check,
+            ):
+                version_mismatches[pkg_id] = version_for_check
+
+        # 常見情況：沒有重複定義，且已安裝套件與需求完全一致時直接回傳
+        if (
+            not inconsistencies[PackageStatus.DUPLICATE]
+            and not version_mismatches
+            and listed_ids.isdisjoint(all_dependencies_ids)
+            and listed_ids <= installed_packages.keys()
+            and {canonicalize_name(pkg_id) for pkg_id in installed_packages}
+            <= listed_ids | all_dependencies_ids
+        ):
+            return inconsistencies
 
         # 先檢查冗餘套件，使用標準化的 ID 進行比較
         for pkg_id, dep_info in requirements.items():
@@ -1026,50 +1630,20 @@ class PackageAnalyzer:
                 )
                 continue
 
-            # 檢查版本是否匹配（跳過已經處理過的重複定義套件）
-            if normalized_id not in duplicates:
-                installed_version = installed_packages[normalized_id][
-                    "installed_version"
-                ]
-
-                # 根據來源選擇正確的版本規範
-                if use_pyproject:
-                    # 如果使用 pyproject.toml，優先使用其版本規範
-                    version_for_check = dep_info.versions.get(
-                        DependencySource.PYPROJECT, ""
-                    )
-                    # 如果套件不在 pyproject.toml 中，才使用 requirements.txt 的版本
-                    if not version_for_check:
-                        version_for_check = dep_info.versions.get(
-                            DependencySource.REQUIREMENTS, ""
-                        )
-                else:
-                    # 如果使用 requirements.txt，使用其版本規範
-                    version_for_check = dep_info.versions.get(
-                        DependencySource.REQUIREMENTS, ""
-                    )
-
-                if version_for_check and not self._check_version_compatibility(
-                    installed_version, version_for_check
-                ):
-                    # 將版本規範資訊一併儲存，以便後續顯示
-                    inconsistencies[PackageStatus.VERSION_MISMATCH].append(
-                        (dep_info.name, version_for_check)
-                    )
+            # 版本不符沿用上方的檢查結果，將版本規範資訊一併儲存以便後續顯示
+            if pkg_id in version_mismatches:
+                inconsistencies[PackageStatus.VERSION_MISMATCH].append(
+                    (dep_info.name, version_mismatches[pkg_id])
+                )
 
         # 檢查已安裝但不在 requirements 中的套件
-        for pkg_id, pkg_info in installed_packages.items():
-            normalized_id = canonicalize_name(pkg_id)
-            # 檢查是否在 requirements 中（使用標準化的 ID）
-            if not any(
-                canonicalize_name(req.name) == normalized_id
-                for req in requirements.values()
-            ):
-                # 檢查是否是其他套件的依賴
-                if normalized_id not in all_dependencies_ids:
-                    inconsistencies[PackageStatus.NOT_IN_REQUIREMENTS].append(
-                        pkg_info.get("name", pkg_id)
-                    )
+        # 先排除已列出或為其他套件依賴的 ID，只處理剩下的套件
+        excluded_ids = listed_ids | all_dependencies_ids
+        inconsistencies[PackageStatus.NOT_IN_REQUIREMENTS].extend(
+            pkg_info.get("name", pkg_id)
+            for pkg_id, pkg_info in installed_packages.items()
+            if canonicalize_name(pkg_id) not in excluded_ids
+        )
 
         # 對每個列表進行排序以保持穩定的輸出順序
         for status in inconsistencies:
@@ -3,18 +3,88 @@
 import os
 import sys
 import subprocess
+from collections import defaultdict
+from functools import lru_cache
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, List, Optional, Tuple, Any, Set, FrozenSet
 from ..ui.console import progress_status, print_error, console, print_warning
 from rich.text import Text
 from rich.tree import Tree
-from rich.style import Style
-from .package_analyzer import PackageAnalyzer, DependencyInfo, DependencySource
-from .version_utils import parse_requirement_string
+from .package_analyzer import (
+    PackageAnalyzer,
+    DependencyInfo,
+    DependencySource,
+    normalize_package_id,
+)
+from .version_utils import (
+    parse_requirement_string,
+    check_version_compatibility,
+    CONSTRAINT_PREFIXES,
+)
 from .events import events, EventType
 from packaging import version
+from packaging.utils import canonicalize_name
 import re
-import requests
+
+# pip 輸出中的升級提示（"new release ... 23.2.1 -> 24.0"）與可用版本清單
+# （"from versions: 1.0, 1.1)"，只擷取括號內的內容），以單一模式一次掃描
+PIP_STDERR_PATTERN = re.compile(
+    r"new release.*?(\S+)\s+->\s+(\S+)|from versions:\s*\(?([^)\n]*)",
+    re.IGNORECASE,
+)
+
+# 已成功查詢的 PyPI 發行版本，同一套件再次失敗時不必重新連線
+_pypi_releases_cache: Dict[str, Tuple[str, ...]] = {}
+
+
+def _scan_pip_stderr(
+    stderr: str,
+) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+    """Find the pip upgrade notice and available-versions list in pip output
+
+    Args:
+        stderr: Error output from pip, or part of it
+
+    Returns:
+        Tuple of ((current, latest) from the last upgrade notice or None,
+        versions listed after the first "from versions:" or None)
+    """
+    upgrade = None
+    versions_str = None
+    for match in PIP_STDERR_PATTERN.finditer(stderr):
+        if match.group(3) is None:
+            upgrade = match.group(1, 2)
+        elif versions_str is None:
+            versions_str = match.group(3)
+    return upgrade, versions_str
+
+
+@lru_cache(maxsize=None)
+def _get_pypi_session() -> Any:
+    """Get the shared requests session for PyPI lookups
+
+    requests is only imported here, so commands that never query PyPI do
+    not pay for it at startup.
+
+    Returns:
+        requests.Session with pooled, retrying HTTPS connections
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # 共用連線池，並行查詢 PyPI 時不必每次重新建立 TLS 連線
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        ),
+    )
+    return session
 
 
 class PackageManager:
@@ -29,9 +99,25 @@ class PackageManager:
         self.venv_path = venv_path
         self.requirements_path = Path("requirements.txt")
         self._pip_path = self._get_pip_path()
+        # pip 子程序共用的環境變數：略過每次執行時連網檢查 pip 新版本，
+        # 並避免在非互動執行時等待輸入
+        self._pip_env = {
+            **os.environ,
+            "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+            "PIP_NO_INPUT": "1",
+        }
 
         # Initialize package analyzer with project root directory
         self.package_analyzer = PackageAnalyzer()
+        # 版本、依賴與反向依賴的扁平索引及其建立時所用的套件快照
+        self._indices: Optional[
+            Tuple[
+                Dict[str, Dict[str, Any]],
+                Dict[str, str],
+                Dict[str, List[str]],
+                Dict[str, FrozenSet[str]],
+            ]
+        ] = None
 
     def _check_pip_upgrade(self, stderr: str) -> None:
         """Check if pip needs upgrade and handle it
@@ -39,29 +125,16 @@ class PackageManager:
         Args:
             stderr: Error output from pip
         """
-        if "new version of pip available" in stderr.lower():
-            try:
-                # Get current and latest version
-                current_version = None
-                latest_version = None
-                for line in stderr.split("\n"):
-                    if "new release" in line.lower():
-                        parts = line.split()
-                        for i, part in enumerate(parts):
-                            if part == "->":
-                                current_version = parts[i - 1]
-                                latest_version = parts[i + 1]
-                                break
-
-                if current_version and latest_version:
-                    console.print(
-                        f"[yellow]⚠ A new version of pip is available: {current_version} -> {latest_version}[/yellow]"
-                    )
-                    console.print(
-                        "[dim]To update, run: pip install --upgrade pip[/dim]"
-                    )
-            except Exception:
-                pass
+        # 直接以升級提示的正規表達式判斷，不必先複製整段輸出轉成小寫；
+        # pip 的提示文字為 "A new release of pip is available"
+        current_version, latest_version = self._get_pip_versions(stderr)
+        if current_version and latest_version:
+            console.print(
+                f"[yellow]⚠ A new version of pip is available: {current_version} -> {latest_version}[/yellow]"
+            )
+            console.print(
+                "[dim]To update, run: pip install --upgrade pip[/dim]"
+            )
 
     def _build_dependency_tree(
         self,
@@ -69,33 +142,53 @@ class PackageManager:
         version: str,
         deps: List[str],
         visited: Optional[Set[str]] = None,
+        packages: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> Tree:
         """Build a rich Tree structure for package dependencies"""
         if visited is None:
             visited = set()
-
-        # Create tree node
-        tree = Tree(
-            Text.assemble(
-                (name, "cyan"),
-                ("==", "dim"),
-                (version, "cyan"),
+        if packages is None:
+            # 只取得一次快照，整棵樹共用
+            packages = self._get_installed_packages()
+
+        def node(name: str, version: str) -> Tree:
+            return Tree(
+                Text.assemble(
+                    (name, "cyan"),
+                    ("==", "dim"),
+                    (version, "cyan"),
+                )
             )
-        )
 
-        # Add dependencies
+        # 以明確的堆疊取代遞迴，每層保留尚未走訪的依賴迭代器，
+        # 走訪順序與 visited 的判斷時機都與深度優先遞迴相同
+        root = node(name, version)
+        stack = []
         if deps:
             visited.add(name)
-            for dep in sorted(deps):
-                if dep not in visited:
-                    dep_version = self._get_installed_version(dep)
-                    dep_deps = self._check_dependencies(dep)
-                    dep_tree = self._build_dependency_tree(
-                        dep, dep_version, dep_deps, visited
-                    )
-                    tree.add(dep_tree)
+            # 快照中的依賴清單已排序，只需排序呼叫端傳入的根節點清單
+            stack.append((root, iter(sorted(deps))))
+        while stack:
+            tree, pending = stack[-1]
+            for dep in pending:
+                if dep in visited:
+                    continue
+                dep_info = packages.get(dep)
+                if dep_info:
+                    child = node(dep, dep_info["installed_version"])
+                    child_deps = dep_info["dependencies"]
+                else:
+                    child = node(dep, None)
+                    child_deps = None
+                tree.add(child)
+                if child_deps:
+                    visited.add(dep)
+                    stack.append((child, iter(child_deps)))
+                    break
+            else:
+                stack.pop()
 
-        return tree
+        return root
 
     def _update_dependency_files(
         self, *, added: List[str] = None, removed: List[str] = None
@@ -119,41 +212,248 @@ class PackageManager:
 
             proj_manager = PyProjectManager(pyproject_path)
 
-            if added:
-                for pkg_spec in added:
-                    try:
-                        # Parse full package spec including extras
-                        pkg_info = parse_requirement_string(pkg_spec)
-                        pkg_name, pkg_extras, _, pkg_version = pkg_info
-
-                        if not pkg_version:
-                            # Get installed version if not specified
-                            pkg_version = self._get_installed_version(pkg_name)
-
-                        if pkg_version:
-                            # Construct full package name with extras
-                            if pkg_extras:
-                                extras_str = f"[{','.join(sorted(pkg_extras))}]"
-                                full_pkg_name = f"{pkg_name}{extras_str}"
-                            else:
-                                full_pkg_name = pkg_name
+            # 所有新增與移除都整批套用，pyproject.toml 只解析與寫入一次
+            to_add = []
+            for pkg_spec in added or ():
+                try:
+                    # Parse full package spec including extras
+                    pkg_info = parse_requirement_string(pkg_spec)
+                    pkg_name, pkg_extras, _, pkg_version = pkg_info
+
+                    if not pkg_version:
+                        # Get installed version if not specified
+                        pkg_version = self._get_installed_version(pkg_name)
 
-                            proj_manager.add_dependency(
-                                full_pkg_name, pkg_version, ">="
+                    if pkg_version:
+                        # Construct full package name with extras
+                        if pkg_extras:
+                            extras_str = f"[{','.join(sorted(pkg_extras))}]"
+                            full_pkg_name = f"{pkg_name}{extras_str}"
+                        else:
+                            full_pkg_name = pkg_name
+
+                        to_add.append((full_pkg_name, pkg_version, ">="))
+                except Exception as e:
+                    print_warning(
+                        f"Warning: Failed to add {pkg_spec} to pyproject.toml: {str(e)}"
+                    )
+
+            try:
+                with proj_manager.bulk_operation():
+                    if to_add:
+                        try:
+                            proj_manager.add_dependencies(to_add)
+                        except Exception as e:
+                            print_warning(
+                                f"Warning: Failed to add packages to pyproject.toml: {str(e)}"
+                            )
+                    if removed:
+                        try:
+                            proj_manager.remove_dependencies(removed)
+                        except Exception as e:
+                            print_warning(
+                                f"Warning: Failed to remove packages from pyproject.toml: {str(e)}"
                             )
-                    except Exception as e:
-                        print_warning(
-                            f"Warning: Failed to add {pkg_name} to pyproject.toml: {str(e)}"
-                        )
-
-            if removed:
-                for pkg_name in removed:
-                    try:
-                        proj_manager.remove_dependency(pkg_name)
-                    except Exception as e:
-                        print_warning(
-                            f"Warning: Failed to remove {pkg_name} from pyproject.toml: {str(e)}"
-                        )
+            except OSError as e:
+                print_warning(
+                    f"Warning: Failed to write pyproject.toml: {str(e)}"
+                )
+
+    @staticmethod
+    def _format_install_spec(
+        pkg_name: str, pkg_extras: Optional[Set[str]], pkg_version: str
+    ) -> str:
+        """Build the pip spec for a package, pinning the version if given
+
+        Args:
+            pkg_name: Name of the package
+            pkg_extras: Optional set of extras
+            pkg_version: Optional version to pin
+
+        Returns:
+            Package spec such as name[extra]==1.0
+        """
+        # Construct package spec with extras if present
+        if pkg_extras:
+            extras_str = f"[{','.join(sorted(pkg_extras))}]"
+            pkg_spec = f"{pkg_name}{extras_str}"
+        else:
+            pkg_spec = pkg_name
+
+        if pkg_version:
+            pkg_spec = f"{pkg_spec}=={pkg_version}"
+        return pkg_spec
+
+    def _pip_install_command(
+        self, pip_specs: List[str], *, editable: bool, no_deps: bool
+    ) -> List[str]:
+        """Build a pip install command for one or more package specs
+
+        Args:
+            pip_specs: Package specs to install
+            editable: Whether to install in editable mode
+            no_deps: Whether to skip installing package dependencies
+
+        Returns:
+            Command line as a list of arguments
+        """
+        cmd = [str(self._pip_path), "install"]
+        if no_deps:
+            cmd.append("--no-deps")
+        for pip_spec in pip_specs:
+            # -e 只作用於緊接在後的單一套件
+            if editable:
+                cmd.append("-e")
+            cmd.append(pip_spec)
+        return cmd
+
+    def _install_batch(
+        self,
+        pip_specs: List[str],
+        *,
+        editable: bool,
+        no_deps: bool,
+    ) -> bool:
+        """Install all packages with a single pip invocation
+
+        Args:
+            pip_specs: Package specs to install
+            editable: Whether to install in editable mode
+            no_deps: Whether to skip installing package dependencies
+
+        Returns:
+            bool: True if pip installed every package
+        """
+        total_packages = len(pip_specs)
+        # 整批只送出一次進度更新；失敗改逐一安裝時，進度才從第一個套件開始
+        events.emit(
+            EventType.Package.INSTALLING,
+            f"{total_packages} packages",
+            is_dependency=False,
+            total_packages=total_packages,
+            current_index=0,
+        )
+
+        try:
+            process = subprocess.run(
+                self._pip_install_command(
+                    pip_specs, editable=editable, no_deps=no_deps
+                ),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                env=self._pip_env,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return process.returncode == 0
+
+    def _find_installed_specs(
+        self, package_specs: List[Tuple], *, editable: bool
+    ) -> Set[int]:
+        """Find packages a failed batch install already put in place
+
+        Args:
+            package_specs: Parsed (name, extras, constraint, version) tuples
+            editable: Whether packages are installed in editable mode
+
+        Returns:
+            Set of 1-based indexes of specs whose package is installed at the
+            requested version
+        """
+        # 可編輯安裝及帶 extras 的套件無法從 metadata 確認已完整安裝
+        if editable:
+            return set()
+
+        self.package_analyzer.clear_cache()
+        packages_now = self.package_analyzer.read_distributions(
+            pkg_name for pkg_name, _, _, _ in package_specs
+        )
+        found = set()
+        for index, (pkg_name, pkg_extras, _, pkg_version) in enumerate(
+            package_specs, 1
+        ):
+            pkg_info = packages_now.get(normalize_package_id(pkg_name))
+            if (
+                pkg_info
+                and not pkg_extras
+                and (
+                    not pkg_version
+                    or check_version_compatibility(
+                        pkg_info["installed_version"], f"=={pkg_version}"
+                    )
+                )
+            ):
+                found.add(index)
+        return found
+
+    def _run_pip_install(
+        self, cmd: List[str]
+    ) -> Tuple[int, str, Optional[str]]:
+        """Run a pip install command, reading its stderr as it is written
+
+        pip's stdout (download and build progress) is discarded instead of
+        buffered, and the available-versions list is picked out while
+        stderr streams in.
+
+        Args:
+            cmd: pip command to run
+
+        Returns:
+            Tuple of (return code, stderr, versions listed after
+            "from versions:" or None)
+        """
+        stderr_lines = []
+        versions_str = None
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=self._pip_env,
+        ) as process:
+            for line in process.stderr:
+                stderr_lines.append(line)
+                if versions_str is None:
+                    versions_str = _scan_pip_stderr(line)[1]
+        return process.returncode, "".join(stderr_lines), versions_str
+
+    @staticmethod
+    def _fetch_pypi_releases(pkg_names: List[str]) -> Dict[str, List[str]]:
+        """Fetch release versions of several packages from PyPI concurrently
+
+        Args:
+            pkg_names: Names of packages to look up
+
+        Returns:
+            Dict mapping package names to release versions, newest first;
+            packages whose lookup failed are left out
+        """
+
+        def fetch(pkg_name: str) -> Optional[List[str]]:
+            releases = _pypi_releases_cache.get(pkg_name)
+            if releases is None:
+                try:
+                    response = session.get(
+                        f"https://pypi.org/pypi/{pkg_name}/json", timeout=2
+                    )
+                    if response.status_code != 200:
+                        return None
+                    releases = tuple(
+                        sorted(response.json()["releases"].keys(), reverse=True)
+                    )
+                except Exception:
+                    return None
+                _pypi_releases_cache[pkg_name] = releases
+            return list(releases)
+
+        # 在主執行緒建立 session，避免多個執行緒同時初始化
+        session = _get_pypi_session()
+        # 查詢以網路等待為主，並行送出讓總耗時約等於單次往返
+        with ThreadPoolExecutor(max_workers=min(10, len(pkg_names))) as pool:
+            releases = dict(zip(pkg_names, pool.map(fetch, pkg_names)))
+        return {name: vers for name, vers in releases.items() if vers}
 
     def add_packages(
         self,
@@ -162,6 +462,7 @@ class PackageManager:
         dev: bool = False,
         editable: bool = False,
         no_deps: bool = False,
+        batch: bool = True,
     ) -> Dict[str, Dict[str, Any]]:
         """Add packages to the virtual environment
 
@@ -170,16 +471,42 @@ class PackageManager:
             dev: Whether to install as development dependency
             editable: Whether to install in editable mode
             no_deps: Whether to skip installing package dependencies
+            batch: Whether to try installing all packages in one pip run
+                before falling back to one run per package
 
         Returns:
             Dict with installation results for each package
         """
         results = {}
         successfully_added = []
+        installed = {}  # pkg_name -> (index, pkg_extras) of successful installs
+        # 需向 PyPI 查詢版本的失敗套件，於迴圈結束後並行查詢
+        pypi_lookups = []  # (index, pkg_name, pkg_extras)
         total_packages = len(packages)
 
         # Parse package specifications
         package_specs = [parse_requirement_string(pkg) for pkg in packages]
+        pip_specs = [
+            self._format_install_spec(pkg_name, pkg_extras, pkg_version)
+            for pkg_name, pkg_extras, _, pkg_version in package_specs
+        ]
+        # 安裝前只讀取要安裝套件的 metadata，用來區分新增的依賴
+        packages_before = self.package_analyzer.read_distributions(
+            pkg_name for pkg_name, _, _, _ in package_specs
+        )
+
+        # 先以單一 pip 程序安裝全部套件，讓 resolver 一次處理共用的依賴；
+        # 失敗時再逐一安裝，以取得每個套件各自的錯誤訊息
+        batch_tried = batch and total_packages > 1
+        batch_installed = batch_tried and self._install_batch(
+            pip_specs, editable=editable, no_deps=no_deps
+        )
+        # pip 中止前可能已裝好部分套件，只逐一安裝仍缺少或版本不符的套件
+        already_installed = (
+            self._find_installed_specs(package_specs, editable=editable)
+            if batch_tried and not batch_installed
+            else set()
+        )
 
         for index, (
             pkg_name,
@@ -187,6 +514,11 @@ class PackageManager:
             pkg_constraint,
             pkg_version,
         ) in enumerate(package_specs, 1):
+            if batch_installed or index in already_installed:
+                results[pkg_name] = None
+                installed[pkg_name] = (index, pkg_extras)
+                continue
+
             try:
                 # Emit package installation start event
                 events.emit(
@@ -200,84 +532,23 @@ class PackageManager:
                     current_index=index,
                 )
                 # Install package
-                cmd = [str(self._pip_path), "install"]
-                if editable:
-                    cmd.append("-e")
-                if no_deps:
-                    cmd.append("--no-deps")
-
-                # Construct package spec with extras if present
-                if pkg_extras:
-                    extras_str = f"[{','.join(sorted(pkg_extras))}]"
-                    pkg_spec = f"{pkg_name}{extras_str}"
-                else:
-                    pkg_spec = pkg_name
-
-                if pkg_version:
-                    pkg_spec = f"{pkg_spec}=={pkg_version}"
-
-                cmd.append(pkg_spec)
-
-                process = subprocess.run(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-
-                if process.returncode == 0:
-                    # Get installed version and dependencies
-                    self.package_analyzer.clear_cache()
-                    packages_after = (
-                        self.package_analyzer.get_installed_packages()
+                returncode, stderr, versions_str = self._run_pip_install(
+                    self._pip_install_command(
+                        [pip_specs[index - 1]],
+                        editable=editable,
+                        no_deps=no_deps,
                     )
+                )
 
-                    # Try to find the package with case-insensitive matching
-                    pkg_name_lower = pkg_name.lower()
-                    matching_pkg = None
-                    for installed_pkg, info in packages_after.items():
-                        if installed_pkg.lower() == pkg_name_lower:
-                            matching_pkg = installed_pkg
-                            pkg_info = info
-                            break
-
-                    if matching_pkg:
-                        version = pkg_info["installed_version"]
-                        # Construct full package spec with extras
-                        if pkg_extras:
-                            extras_str = f"[{','.join(sorted(pkg_extras))}]"
-                            full_pkg_spec = (
-                                f"{matching_pkg}{extras_str}=={version}"
-                            )
-                        else:
-                            full_pkg_spec = f"{matching_pkg}=={version}"
-
-                        successfully_added.append(full_pkg_spec)
-                        results[matching_pkg] = {
-                            "status": "installed",
-                            "version": version,
-                            "extras": pkg_extras,  # Store extras information
-                            "dependencies": sorted(pkg_info["dependencies"]),
-                            "new_dependencies": sorted(
-                                pkg_info["dependencies"]
-                            ),
-                        }
-                        # Emit package installation success event
-                        events.emit(
-                            EventType.Package.INSTALLED,
-                            matching_pkg,
-                            extras=pkg_extras,
-                            version=version,
-                            total_packages=total_packages,
-                            current_index=index,
-                            dependencies=pkg_info["dependencies"],
-                        )
+                if returncode == 0:
+                    # 安裝後的套件資訊在全部安裝完成後一次掃描取得
+                    results[pkg_name] = None
+                    installed[pkg_name] = (index, pkg_extras)
                 else:
                     # Extract version information from pip's error output
-                    error_output = (
-                        process.stderr if process.stderr else "Unknown error"
-                    )
+                    error_output = stderr if stderr else "Unknown error"
                     version_info = {}
+                    needs_pypi = False
 
                     # Try to get available versions from error message
                     if (
@@ -287,18 +558,10 @@ class PackageManager:
                         try:
                             # Extract versions from error message
                             versions = []
-                            for line in error_output.split("\n"):
-                                if "from versions:" in line:
-                                    versions_str = line.split(
-                                        "from versions:", 1
-                                    )[1].strip()
-                                    versions = [
-                                        v.strip()
-                                        for v in versions_str.strip("()").split(
-                                            ","
-                                        )
-                                    ]
-                                    break
+                            if versions_str is not None:
+                                versions = [
+                                    v.strip() for v in versions_str.split(",")
+                                ]
 
                             if versions:
                                 version_info["latest_versions"] = ", ".join(
@@ -309,35 +572,22 @@ class PackageManager:
                                     f"[cyan]{v}[/cyan]"
                                     for v in versions[-6:-3][::-1]
                                 )
+                            else:
+                                # pip 未列出可用版本時才向 PyPI 查詢
+                                needs_pypi = True
                         except Exception:
                             # If parsing fails, try to get from PyPI
-                            try:
-                                response = requests.get(
-                                    f"https://pypi.org/pypi/{pkg_name}/json"
-                                )
-                                if response.status_code == 200:
-                                    data = response.json()
-                                    versions = sorted(
-                                        data["releases"].keys(), reverse=True
-                                    )
-                                    version_info["latest_versions"] = ", ".join(
-                                        f"[cyan]{v}[/cyan]"
-                                        for v in versions[:3]
-                                    )
-                                    version_info["similar_versions"] = (
-                                        ", ".join(
-                                            f"[cyan]{v}[/cyan]"
-                                            for v in versions[3:6]
-                                        )
-                                    )
-                            except Exception:
-                                pass
+                            needs_pypi = True
 
                     results[pkg_name] = {
                         "status": "error",
                         "message": error_output,
                         "version_info": version_info,
                     }
+                    if needs_pypi:
+                        # 失敗事件待 PyPI 查詢完成、version_info 填妥後再送出
+                        pypi_lookups.append((index, pkg_name, pkg_extras))
+                        continue
                     # Emit package installation failure event
                     events.emit(
                         EventType.Package.FAILED,
@@ -364,6 +614,93 @@ class PackageManager:
                     current_index=index,
                 )
 
+        if pypi_lookups:
+            releases = self._fetch_pypi_releases(
+                [pkg_name for _, pkg_name, _ in pypi_lookups]
+            )
+            for index, pkg_name, pkg_extras in pypi_lookups:
+                result = results[pkg_name]
+                versions = releases.get(pkg_name)
+                if versions:
+                    result["version_info"]["latest_versions"] = ", ".join(
+                        f"[cyan]{v}[/cyan]" for v in versions[:3]
+                    )
+                    result["version_info"]["similar_versions"] = ", ".join(
+                        f"[cyan]{v}[/cyan]" for v in versions[3:6]
+                    )
+                events.emit(
+                    EventType.Package.FAILED,
+                    pkg_name,
+                    extras=pkg_extras,
+                    error=result["message"],
+                    version_info=result["version_info"],
+                    total_packages=total_packages,
+                    current_index=index,
+                )
+
+        if installed:
+            # 只讀取剛安裝套件的 metadata，不重新掃描整個 site-packages
+            self.package_analyzer.clear_cache()
+            packages_after = self.package_analyzer.read_distributions(installed)
+            if len(packages_after) < len(installed):
+                # 目錄名稱無法對應時改用完整掃描
+                packages_after = self._get_installed_packages()
+
+            # 依安裝順序放回結果並送出事件，找不到的套件不列入
+            ordered_results = {}
+            for pkg_name, result in results.items():
+                if result is not None:
+                    ordered_results[pkg_name] = result
+                    continue
+
+                index, pkg_extras = installed[pkg_name]
+                matching_pkg = normalize_package_id(pkg_name)
+                pkg_info = packages_after.get(matching_pkg)
+                if not pkg_info:
+                    continue
+
+                version = pkg_info["installed_version"]
+                # Construct full package spec with extras
+                if pkg_extras:
+                    extras_str = f"[{','.join(sorted(pkg_extras))}]"
+                    full_pkg_spec = f"{matching_pkg}{extras_str}=={version}"
+                else:
+                    full_pkg_spec = f"{matching_pkg}=={version}"
+
+                successfully_added.append(full_pkg_spec)
+                previous_deps = set(
+                    packages_before.get(matching_pkg, {}).get(
+                        "dependencies", ()
+                    )
+                )
+                ordered_results[matching_pkg] = {
+                    "status": "installed",
+                    "version": version,
+                    "extras": pkg_extras,  # Store extras information
+                    "dependencies": list(pkg_info["dependencies"]),
+                    "new_dependencies": [
+                        dep
+                        for dep in pkg_info["dependencies"]
+                        if dep not in previous_deps
+                    ],
+                    "existing_dependencies": [
+                        dep
+                        for dep in pkg_info["dependencies"]
+                        if dep in previous_deps
+                    ],
+                }
+                # Emit package installation success event
+                events.emit(
+                    EventType.Package.INSTALLED,
+                    matching_pkg,
+                    extras=pkg_extras,
+                    version=version,
+                    total_packages=total_packages,
+                    current_index=index,
+                    dependencies=pkg_info["dependencies"],
+                )
+            results = ordered_results
+
         # Update dependency files only after successful installations
         if successfully_added:
             self._update_dependency_files(added=successfully_added)
@@ -374,6 +711,7 @@ class PackageManager:
         self,
         package_names: List[str],
         excluded_packages: Optional[List[str]] = None,
+        dependency_tree: Optional[Dict[str, Dict]] = None,
     ) -> Dict[str, List[Dict[str, str]]]:
         """
         Get a list of unique dependencies (including itself) for multiple top-level packages,
@@ -382,46 +720,62 @@ class PackageManager:
         Args:
         package_names: List of packages to remove
         excluded_packages: List of packages to exclude
+        dependency_tree: Pre-computed dependency tree snapshot to reuse
 
         Returns:
         Dict[str, List[Dict[str, str]]]: Format is
         {top-level package name: [{name: package name, installed_version: version}, ...]}
         """
         # Get full dependency tree
-        dependency_tree = self.package_analyzer.get_dependency_tree()
+        if dependency_tree is None:
+            dependency_tree = self.package_analyzer.get_dependency_tree()
 
-        # Internal function: Recursively collect dependencies of a package and its sub-dependencies
+        # Internal function: Collect dependencies of a package and its sub-dependencies
         def gather_deps(
-            pkg_obj: Dict, visited: Optional[Set[str]] = None
+            pkg_obj: Dict,
+            visited: Optional[Set[str]] = None,
+            shared: Set[str] = frozenset(),
         ) -> Dict[str, Dict]:
             if visited is None:
                 visited = set()
-            pkg_name = pkg_obj.get("name")
-            if not pkg_name or pkg_name in visited:
-                return {}
-            visited.add(pkg_name)
-            result = {pkg_name: pkg_obj}
-            for dep in pkg_obj.get("dependencies", {}).values():
-                result.update(gather_deps(dep, visited))
+            result = {}
+            # 以堆疊走訪（子節點反向放入），順序與遞迴的前序走訪相同
+            stack = [pkg_obj]
+            while stack:
+                obj = stack.pop()
+                pkg_name = obj.get("name")
+                if not pkg_name or pkg_name in visited:
+                    continue
+                if pkg_name in shared:
+                    # 共用依賴的子樹也都被保留套件使用，整棵略過
+                    continue
+                visited.add(pkg_name)
+                result[pkg_name] = obj
+                stack.extend(
+                    reversed(list(obj.get("dependencies", {}).values()))
+                )
             return result
 
         removal_set = set(package_names)
         non_removal_top_levels = set(dependency_tree.keys()) - removal_set
 
+        # Collect non-removal top-level packages and their dependencies (considered as shared dependencies)
+        # 只需要名稱集合：共用的 visited 走訪完即為所有保留套件的依賴閉包，
+        # 重疊的子樹只走訪一次
+        non_removal_deps = set()
+        for pkg_name in non_removal_top_levels:
+            gather_deps(dependency_tree[pkg_name], non_removal_deps)
+
         # Collect removal candidates for each package to be removed
+        # 閉包已先算好，走訪時遇到共用依賴即停止，只展開可移除的部分
         removal_candidates = {}
         for pkg_name in package_names:
             if pkg_name not in dependency_tree:
                 continue
             removal_candidates[pkg_name] = gather_deps(
-                dependency_tree[pkg_name]
+                dependency_tree[pkg_name], shared=non_removal_deps
             )
 
-        # Collect non-removal top-level packages and their dependencies (considered as shared dependencies)
-        non_removal_deps = {}
-        for pkg_name in non_removal_top_levels:
-            non_removal_deps.update(gather_deps(dependency_tree[pkg_name]))
-
         # Convert excluded packages to set
         excluded_set = (
             set(excluded_packages) if excluded_packages is not None else set()
@@ -432,10 +786,7 @@ class PackageManager:
         for top_pkg, candidate in removal_candidates.items():
             removable = {}
             for pkg_name, pkg_info in candidate.items():
-                if (
-                    pkg_name not in non_removal_deps
-                    and pkg_name not in excluded_set
-                ):
+                if pkg_name not in excluded_set:
                     removable[pkg_name] = pkg_info
             result[top_pkg] = [
                 {
@@ -447,6 +798,27 @@ class PackageManager:
 
         return result
 
+    def _pip_uninstall(self, pkg_names: List[str]) -> Tuple[bool, str]:
+        """Uninstall packages with a single pip invocation
+
+        Args:
+            pkg_names: Names of the packages to uninstall
+
+        Returns:
+            Tuple of (success, error_message)
+        """
+        try:
+            process = subprocess.run(
+                [str(self._pip_path), "uninstall", "-y", *pkg_names],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=self._pip_env,
+            )
+        except Exception as e:
+            return False, str(e)
+        return process.returncode == 0, process.stderr
+
     def remove_packages(
         self,
         packages: List[str],
@@ -466,7 +838,7 @@ class PackageManager:
 
         # Get all packages that can be safely removed
         removable_packages = self.get_packages_to_remove(
-            packages, excluded_packages
+            packages, excluded_packages, dependency_tree=dependency_tree
         )
         all_to_remove = set()  # Collect all packages to remove
         pkg_versions = {}  # Collect all package version information
@@ -479,6 +851,7 @@ class PackageManager:
                 pkg_versions[pkg_name] = dep["installed_version"]
 
         # First check if the top-level packages to remove exist
+        removals = {}  # package name -> result once it is removed
         for pkg_name in packages:
             pkg_info = dependency_tree.get(pkg_name, {})
             if not pkg_info:
@@ -499,60 +872,42 @@ class PackageManager:
                 if dep_name != pkg_name:  # Exclude itself
                     removable_deps[dep_name] = dep["installed_version"]
 
-            try:
-                # Execute pip uninstall
-                process = subprocess.run(
-                    [str(self._pip_path), "uninstall", "-y", pkg_name],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if process.returncode == 0:
-                    results[pkg_name] = {
-                        "status": "removed",
-                        "version": pkg_versions.get(pkg_name),
-                        "removable_deps": removable_deps,
-                    }
-                else:
-                    results[pkg_name] = {
-                        "status": "error",
-                        "message": process.stderr,
-                    }
-
-            except Exception as e:
-                results[pkg_name] = {
-                    "status": "error",
-                    "message": str(e),
-                }
+            results[pkg_name] = None  # 保留結果順序，移除後再填入
+            removals[pkg_name] = {
+                "status": "removed",
+                "version": pkg_versions.get(pkg_name),
+                "removable_deps": removable_deps,
+            }
 
         # Remove remaining dependency packages
         remaining_deps = all_to_remove - set(packages)
         for dep_name in sorted(remaining_deps):
-            if dep_name not in results:  # Avoid duplicate removal
-                try:
-                    process = subprocess.run(
-                        [str(self._pip_path), "uninstall", "-y", dep_name],
-                        capture_output=True,
-                        text=True,
-                    )
+            if dep_name not in removals:  # Avoid duplicate removal
+                removals[dep_name] = {
+                    "status": "removed",
+                    "version": pkg_versions.get(dep_name),
+                    "is_dependency": True,
+                }
 
-                    if process.returncode == 0:
-                        results[dep_name] = {
-                            "status": "removed",
-                            "version": pkg_versions.get(dep_name),
-                            "is_dependency": True,
-                        }
-                    else:
-                        results[dep_name] = {
-                            "status": "error",
-                            "message": process.stderr,
-                        }
+        # 先以單一 pip 程序移除全部套件，失敗時再逐一移除以取得各自的錯誤訊息
+        batch_removed = (
+            len(removals) > 1 and self._pip_uninstall(list(removals))[0]
+        )
+        for pkg_name, removed_result in removals.items():
+            if batch_removed:
+                results[pkg_name] = removed_result
+                continue
 
-                except Exception as e:
-                    results[dep_name] = {
-                        "status": "error",
-                        "message": str(e),
-                    }
+            success, message = self._pip_uninstall([pkg_name])
+            results[pkg_name] = (
+                removed_result
+                if success
+                else {"status": "error", "message": message}
+            )
+
+        # 移除後已安裝套件有變動，讓下次查詢重新掃描
+        if removals:
+            self.package_analyzer.clear_cache()
 
         # Update dependency files
         self._update_dependency_files(removed=list(all_to_remove))
@@ -562,28 +917,51 @@ class PackageManager:
     def _get_installed_packages(self) -> Dict[str, Dict[str, Any]]:
         """Get installed packages and their information
 
+        The analyzer keeps the scan until its cache is cleared, which
+        happens after every install and uninstall.
+
         Returns:
             Dict mapping package names to their information
         """
         return self.package_analyzer.get_installed_packages()
 
-    def _get_all_dependencies(self) -> Dict[str, Set[str]]:
-        """Get all packages and their dependents
+    def _get_indices(
+        self,
+    ) -> Tuple[Dict[str, str], Dict[str, List[str]], Dict[str, FrozenSet[str]]]:
+        """Get flat version, dependency and dependent indices
+
+        The indices are rebuilt in one pass whenever the analyzer returns a
+        new package dict, which happens after every install and uninstall.
 
         Returns:
-            Dict mapping package names to sets of packages that depend on them
+            Tuple of (package -> installed version, package -> dependencies,
+            package -> packages that depend on it)
         """
         packages = self._get_installed_packages()
-        dependents = {}
+        if self._indices is None or self._indices[0] is not packages:
+            versions = {}
+            dependencies = {}
+            dependents = defaultdict(set)
+            for pkg_name, pkg_info in packages.items():
+                versions[pkg_name] = pkg_info["installed_version"]
+                deps = dependencies[pkg_name] = pkg_info["dependencies"]
+                for dep in deps:
+                    dependents[dep].add(pkg_name)
+            self._indices = (
+                packages,
+                versions,
+                dependencies,
+                {dep: frozenset(names) for dep, names in dependents.items()},
+            )
+        return self._indices[1:]
 
-        # Build dependency map
-        for pkg_name, pkg_info in packages.items():
-            for dep in pkg_info["dependencies"]:
-                if dep not in dependents:
-                    dependents[dep] = set()
-                dependents[dep].add(pkg_name)
+    def _get_all_dependencies(self) -> Dict[str, FrozenSet[str]]:
+        """Get all packages and their dependents
 
-        return dependents
+        Returns:
+            Dict mapping package names to sets of packages that depend on them
+        """
+        return self._get_indices()[2]
 
     def _get_installed_version(self, package: str) -> Optional[str]:
         """Get installed version of a package
@@ -594,10 +972,7 @@ class PackageManager:
         Returns:
             Version string if installed, None otherwise
         """
-        packages = self.package_analyzer.get_installed_packages()
-        if package in packages:
-            return packages[package]["installed_version"]
-        return None
+        return self._get_indices()[0].get(package)
 
     def _check_conflicts(
         self,
@@ -626,10 +1001,7 @@ class PackageManager:
         Returns:
             List of dependency names
         """
-        packages = self.package_analyzer.get_installed_packages()
-        if package in packages:
-            return packages[package]["dependencies"]
-        return []
+        return self._get_indices()[1].get(package, [])
 
     def _is_dependency(self, package: str) -> Tuple[bool, List[str]]:
         """Check if package is a dependency of other packages
@@ -640,13 +1012,10 @@ class PackageManager:
         Returns:
             Tuple of (is_dependency, list_of_dependent_packages)
         """
-        packages = self.package_analyzer.get_installed_packages()
-        dependents = []
-
-        for pkg_name, pkg_info in packages.items():
-            if pkg_name != package and package in pkg_info["dependencies"]:
-                dependents.append(pkg_name)
-
+        # 以反向索引查詢，不必逐一檢查每個套件的依賴清單
+        dependents = sorted(
+            self._get_all_dependencies().get(package, frozenset()) - {package}
+        )
         return bool(dependents), dependents
 
     def _update_requirements(
@@ -662,100 +1031,82 @@ class PackageManager:
             removed: List of packages to remove
             dev: Whether to update dev dependencies
         """
-        if not self.requirements_path.exists():
-            # Create empty requirements file if it doesn't exist
-            self.requirements_path.touch()
-
-        # Read existing requirements
-        with open(self.requirements_path, "r") as f:
-            requirements = f.readlines()
-
-        # Remove packages if specified
-        if removed:
-            new_requirements = []
-            for req in requirements:
-                req = req.strip()
-                if not req or req.startswith("#"):
-                    new_requirements.append(req + "\n")
-                    continue
-
-                # Parse requirement to get package name
-                pkg_info = parse_requirement_string(req)
-                pkg_name = pkg_info[0]  # Get package name only
-
-                if pkg_name not in removed:
-                    new_requirements.append(req + "\n")
-            requirements = new_requirements
-
-        # Add new packages if specified
-        if added:
-            # Convert added packages to set for deduplication
-            added_set = set()
-            for pkg_spec in added:
-                pkg_info = parse_requirement_string(pkg_spec)
-                pkg_name, pkg_extras, pkg_constraint, pkg_version = pkg_info
-
-                # Create DependencyInfo object
-                dep_info = DependencyInfo(
-                    pkg_name, "", DependencySource.REQUIREMENTS
-                )
-                dep_info.extras = pkg_extras
-                dep_info.version_spec = (
-                    f"{pkg_constraint}{pkg_version}" if pkg_version else ""
-                )
-
-                # Use full_spec to get complete package specification
-                added_set.add(dep_info.full_spec)
-
-            # Remove existing entries for added packages
-            new_requirements = []
-            for req in requirements:
-                req = req.strip()
-                if not req or req.startswith("#"):
-                    new_requirements.append(req + "\n")
-                    continue
-
-                # Parse requirement to get package name
-                pkg_info = parse_requirement_string(req)
-                pkg_name = pkg_info[0]  # Get package name only
+        # Read existing requirements; a missing file is created on write
+        try:
+            with open(self.requirements_path, "r") as f:
+                original = f.read()
+        except FileNotFoundError:
+            original = None
+
+        # 移除與新增的套件都需先刪除既有條目，預先正規化名稱合併成一次掃描
+        drop_ids = {canonicalize_name(pkg) for pkg in removed or ()}
+
+        # Convert added packages to set for deduplication
+        added_set = set()
+        for pkg_spec in added or ():
+            pkg_info = parse_requirement_string(pkg_spec)
+            pkg_name, pkg_extras, pkg_constraint, pkg_version = pkg_info
+
+            # Create DependencyInfo object
+            dep_info = DependencyInfo(
+                pkg_name, "", DependencySource.REQUIREMENTS
+            )
+            dep_info.extras = pkg_extras
+            dep_info.version_spec = (
+                f"{pkg_constraint}{pkg_version}" if pkg_version else ""
+            )
 
-                if pkg_name not in [
-                    p.split("==")[0].split("[")[0] for p in added_set
-                ]:
-                    new_requirements.append(req + "\n")
+            # Use full_spec to get complete package specification
+            added_set.add(dep_info.full_spec)
+            drop_ids.add(dep_info.id)
 
-            # Add new packages
-            new_requirements.extend(f"{pkg}\n" for pkg in sorted(added_set))
-            requirements = new_requirements
+        # 正規化名稱的第一段必為條目開頭（不分大小寫），先以 tuple 前綴
+        # 篩選，只有可能相符的條目才需完整解析
+        drop_prefixes = tuple({pkg_id.split("-", 1)[0] for pkg_id in drop_ids})
 
-        # Write updated requirements
         # Sort all non-comment lines while preserving comments
-        sorted_requirements = []
         package_lines = []
         comment_lines = []
-
-        for line in requirements:
+        for line in (original or "").split("\n"):
             line = line.strip()
             if not line:
                 continue
             if line.startswith("#"):
                 comment_lines.append(line + "\n")
-            else:
-                package_lines.append(line)
+                continue
+
+            # Parse requirement to get package name
+            if drop_ids and line.lower().startswith(drop_prefixes):
+                pkg_name = parse_requirement_string(line)[0]
+                if canonicalize_name(pkg_name) in drop_ids:
+                    continue
+            package_lines.append(line)
+
+        # Add new packages
+        package_lines.extend(sorted(added_set))
 
         # Sort package lines
         package_lines.sort(key=str.lower)
 
         # Combine comments and sorted packages
-        sorted_requirements.extend(comment_lines)
+        sorted_requirements = comment_lines
         if (
             comment_lines and package_lines
         ):  # Add a blank line between comments and packages
             sorted_requirements.append("\n")
         sorted_requirements.extend(f"{pkg}\n" for pkg in package_lines)
 
-        with open(self.requirements_path, "w") as f:
+        # 內容未變動時不寫入，避免更新 mtime 使以 mtime 判斷的快取失效
+        if original is not None and "".join(sorted_requirements) == original:
+            return
+
+        # 先寫入暫存檔再替換，中斷時不會留下寫到一半的檔案
+        tmp_path = self.requirements_path.with_name(
+            self.requirements_path.name + ".tmp"
+        )
+        with open(tmp_path, "w") as f:
             f.writelines(sorted_requirements)
+        os.replace(tmp_path, self.requirements_path)
 
     def _get_pip_path(self) -> Path:
         """Get path to pip executable"""
@@ -773,17 +1124,162 @@ class PackageManager:
         self, stderr: str
     ) -> Tuple[Optional[str], Optional[str]]:
         """Extract current and latest pip versions from stderr"""
-        current_version = None
-        latest_version = None
-        for line in stderr.split("\n"):
-            if "new release" in line.lower():
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if part == "->":
-                        current_version = parts[i - 1]
-                        latest_version = parts[i + 1]
-                        break
-        return current_version, latest_version
+        upgrade, _ = _scan_pip_stderr(stderr)
+        return upgrade or (None, None)
+
+    def _build_package_spec(
+        self, package_name: str, version: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Build a pip package spec from a name and optional version
+
+        Args:
+            package_name: Name of the package
+            version: Optional version, with or without a constraint
+
+        Returns:
+            Tuple of (package_spec, cleaned_version)
+        """
+        if not version:
+            return package_name, version
+
+        version = str(version).strip()
+        # If version string does not contain version constraints, add ==
+        if not version.startswith(CONSTRAINT_PREFIXES):
+            version = version.lstrip("=").strip()
+            return f"{package_name}=={version}", version
+        return f"{package_name}{version}", version
+
+    def install_lock_file(
+        self, lock_path: Path, *, no_deps: bool = True
+    ) -> None:
+        """Install every pinned package in a lock file with one pip call
+
+        A lock file already lists the full dependency set, so pip runs
+        with --no-deps by default and skips dependency resolution.
+
+        Args:
+            lock_path: Path to a pip-compatible lock file
+            no_deps: Whether to skip installing package dependencies
+
+        Raises:
+            RuntimeError: If pip fails to install the lock file
+        """
+        specs = []
+        with open(lock_path, "r") as f:
+            for line in f:
+                # 去除續行、環境標記與同一行的選項（例如 --hash）
+                line = line.split("\\")[0].split(";")[0].split(" --")[0]
+                line = line.strip()
+                if line and not line.startswith(("#", "-")):
+                    # 直接參照（name @ url#sha256=...）只取套件名稱
+                    specs.append(line.split(" @ ")[0].strip())
+
+        # 鎖定檔只會執行一次 pip，事先送出每個套件的安裝事件供 UI 顯示
+        total_packages = len(specs)
+        for index, spec in enumerate(specs, 1):
+            try:
+                pkg_name, pkg_extras, pkg_constraint, pkg_version = (
+                    parse_requirement_string(spec)
+                )
+            except ValueError:
+                continue
+            events.emit(
+                EventType.Package.INSTALLING,
+                pkg_name,
+                extras=pkg_extras,
+                version=pkg_version,
+                constraint=pkg_constraint,
+                is_dependency=False,
+                total_packages=total_packages,
+                current_index=index,
+            )
+
+        cmd = [str(self._pip_path), "install"]
+        if no_deps:
+            cmd.append("--no-deps")
+        cmd.extend(["-r", str(lock_path)])
+
+        process = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=self._pip_env,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(process.stderr or "Unknown error")
+
+        self.package_analyzer.clear_cache()
+
+    def auto_fix_install_batch(
+        self,
+        specs: List[Tuple[str, Optional[str]]],
+        *,
+        dev: bool = False,
+        no_deps: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Install multiple packages together, then retry fixable failures
+
+        Packages are installed through add_packages, which tries a single
+        pip run first and falls back to one run per package; version-related
+        failures are then retried with the latest available version in a
+        single add_packages call.
+
+        Args:
+            specs: List of (package_name, version) tuples
+            dev: Whether to install as development dependency
+            no_deps: Whether to skip installing package dependencies
+
+        Returns:
+            Dict mapping each requested package name to its installation result
+        """
+        if not specs:
+            return {}
+
+        results = {}
+        retries = {}  # package name -> (version, latest_version, reason)
+        built_specs = [
+            self._build_package_spec(name, ver) for name, ver in specs
+        ]
+        # 先整批安裝，失敗時逐一安裝；失敗套件的 PyPI 查詢會一起並行送出
+        install_results = self.add_packages(
+            [package_spec for package_spec, _ in built_specs],
+            dev=dev,
+            no_deps=no_deps,
+        )
+        for (name, _), (_, ver) in zip(specs, built_specs):
+            pkg_info = self._get_result(install_results, name)
+            if not pkg_info:
+                pkg_info = {
+                    "status": "error",
+                    "message": f"Package {name} not found after installation",
+                }
+            results[name] = pkg_info
+
+            fix = self._get_auto_fix(pkg_info)
+            if fix is not None:
+                retries[name] = (ver, *fix)
+
+        if retries:
+            # 需要改版本重試的套件合併為一次安裝
+            retry_results = self.add_packages(
+                [
+                    f"{name}=={latest_version}"
+                    for name, (_, latest_version, _) in retries.items()
+                ],
+                dev=dev,
+                no_deps=no_deps,
+            )
+            for name, (ver, latest_version, reason) in retries.items():
+                results[name] = self._mark_auto_fixed(
+                    self._get_result(retry_results, name),
+                    ver,
+                    latest_version,
+                    reason,
+                )
+
+        return results
 
     def auto_fix_install(
         self,
@@ -808,19 +1304,7 @@ class PackageManager:
             Dict containing installation results with status and additional info
         """
         # Clean and format version string
-        if version:
-            version = str(version).strip()
-            # If version string does not contain version constraints, add ==
-            if not any(
-                version.startswith(op)
-                for op in [">=", "<=", "!=", "~=", ">", "<", "=="]
-            ):
-                version = version.lstrip("=").strip()
-                package_spec = f"{package_name}=={version}"
-            else:
-                package_spec = f"{package_name}{version}"
-        else:
-            package_spec = package_name
+        package_spec, version = self._build_package_spec(package_name, version)
 
         # Try to install
         results = self.add_packages(
@@ -830,103 +1314,184 @@ class PackageManager:
             no_deps=no_deps,
         )
 
-        pkg_info = results.get(package_name, {})
+        pkg_info = self._get_result(results, package_name)
 
         # If installation fails, check if automatic fixing is needed
-        if pkg_info.get("status") != "installed":
-            error_msg = pkg_info.get("message", "")
-            version_info = pkg_info.get("version_info", {})
+        fix = self._get_auto_fix(pkg_info)
+        if fix is None:
+            return pkg_info
+
+        # Use latest version to retry
+        latest_version, update_reason = fix
+        retry_results = self.add_packages(
+            [f"{package_name}=={latest_version}"],
+            dev=dev,
+            editable=editable,
+            no_deps=no_deps,
+        )
+        return self._mark_auto_fixed(
+            self._get_result(retry_results, package_name),
+            version,
+            latest_version,
+            update_reason,
+        )
 
-            # Check if it's a version-related error
-            if (
+    @staticmethod
+    def _get_result(
+        results: Dict[str, Dict[str, Any]], package_name: str
+    ) -> Dict[str, Any]:
+        """Look up a package in add_packages results
+
+        Installed packages are keyed by their normalized ID, failures by the
+        requested name.
+
+        Args:
+            results: Results returned by add_packages
+            package_name: Requested package name
+
+        Returns:
+            Installation result of the package, or an empty dict
+        """
+        return results.get(
+            normalize_package_id(package_name), results.get(package_name, {})
+        )
+
+    @staticmethod
+    def _get_auto_fix(pkg_info: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Decide whether a failed installation can be retried with another version
+
+        Args:
+            pkg_info: Installation result of the package
+
+        Returns:
+            Tuple of (latest_version, update_reason), or None if not fixable
+        """
+        if pkg_info.get("status") == "installed":
+            return None
+
+        error_msg = pkg_info.get("message", "")
+        version_info = pkg_info.get("version_info", {})
+
+        # Check if it's a version-related error
+        if not (
+            (
                 "Version not found" in error_msg
                 or "No matching distribution" in error_msg
                 or "Could not find a version that satisfies the requirement"
                 in error_msg
-            ) and version_info:
-                # Get latest version
-                latest_version = (
-                    version_info["latest_versions"]
-                    .split(",")[0]
-                    .strip()
-                    .replace("[cyan]", "")
-                    .replace("[/cyan]", "")
-                    .replace(" (latest)", "")
-                )
+            )
+            and version_info
+        ):
+            return None
+
+        # Get latest version
+        latest_version = (
+            version_info["latest_versions"]
+            .split(",")[0]
+            .strip()
+            .replace("[cyan]", "")
+            .replace("[/cyan]", "")
+            .replace(" (latest)", "")
+        )
 
-                # Analyze update reason
-                if (
-                    "Python version" in error_msg
-                    or "requires Python" in error_msg
-                ):
-                    update_reason = "Python compatibility issue"
-                elif "dependency conflict" in error_msg:
-                    update_reason = "Dependency conflict"
-                elif (
-                    "not found" in error_msg
-                    or "No matching distribution" in error_msg
-                ):
-                    update_reason = "Version not found"
-                else:
-                    update_reason = "Installation failed"
-
-                # Use latest version to retry
-                retry_results = self.add_packages(
-                    [f"{package_name}=={latest_version}"],
-                    dev=dev,
-                    editable=editable,
-                    no_deps=no_deps,
-                )
+        # Analyze update reason
+        if "Python version" in error_msg or "requires Python" in error_msg:
+            update_reason = "Python compatibility issue"
+        elif "dependency conflict" in error_msg:
+            update_reason = "Dependency conflict"
+        elif (
+            "not found" in error_msg or "No matching distribution" in error_msg
+        ):
+            update_reason = "Version not found"
+        else:
+            update_reason = "Installation failed"
 
-                retry_info = retry_results.get(package_name, {})
-                if retry_info.get("status") == "installed":
-                    retry_info["auto_fixed"] = True
-                    retry_info["original_version"] = version
-                    retry_info["update_reason"] = update_reason
-                    retry_info["installed_version"] = latest_version
-                    return retry_info
+        return latest_version, update_reason
 
-                # If retry also fails, return retry error information
-                return retry_info
+    @staticmethod
+    def _mark_auto_fixed(
+        retry_info: Dict[str, Any],
+        original_version: Optional[str],
+        latest_version: str,
+        update_reason: str,
+    ) -> Dict[str, Any]:
+        """Annotate a successful retry result with auto-fix details
+
+        Args:
+            retry_info: Installation result of the retry
+            original_version: Version originally requested
+            latest_version: Version used for the retry
+            update_reason: Why the version was changed
 
-        return pkg_info
+        Returns:
+            The retry result, annotated if the retry succeeded
+        """
+        if retry_info.get("status") == "installed":
+            retry_info["auto_fixed"] = True
+            retry_info["original_version"] = original_version
+            retry_info["update_reason"] = update_reason
+            retry_info["installed_version"] = latest_version
+
+        # If retry also fails, return retry error information
+        return retry_info
+
+
+# Ordering of pre-release types
+PRE_RELEASE_TYPE_ORDER = {"a": 0, "b": 1, "rc": 2}
 
 
 def _get_pre_release_type_value(pre_type: str) -> int:
     """Get numeric value for pre-release type for ordering"""
-    pre_type_order = {"a": 0, "b": 1, "rc": 2}
-    return pre_type_order.get(pre_type, 3)
+    return PRE_RELEASE_TYPE_ORDER.get(pre_type, 3)
+
+
+# 各版本位數的權重 10**k，預先計算避免每次重算次方
+_RELEASE_WEIGHTS = tuple(10**k for k in range(8))
 
 
+@lru_cache(maxsize=4096)
+def _parse_version(ver_str: str) -> version.Version:
+    """Parse a version string, cached since release lists repeat versions"""
+    return version.parse(ver_str)
+
+
+@lru_cache(maxsize=8192)
 def get_version_distance(ver_str: str, target_str: str) -> float:
     """Calculate distance between two version strings with improved handling of pre-releases"""
     # Parse versions using packaging.version
-    ver = version.parse(ver_str)
-    target = version.parse(target_str)
+    ver = _parse_version(ver_str)
+    if ver_str == target_str:
+        # 相同版本不需比較各部分，預發行版仍保留兩者皆為預發行時的懲罰值
+        return 0.25 if ver.is_prerelease else 0
+    target = _parse_version(target_str)
 
     # Get release components
     ver_release = ver.release
     target_release = target.release
 
-    # Pad with zeros to make same length
+    # Calculate weighted distance for release parts, padding with zeros
     max_len = max(len(ver_release), len(target_release))
-    ver_parts = list(ver_release) + [0] * (max_len - len(ver_release))
-    target_parts = list(target_release) + [0] * (max_len - len(target_release))
-
-    # Calculate weighted distance for release parts
-    distance = 0
-    for i, (a, b) in enumerate(zip(ver_parts, target_parts)):
-        weight = 10 ** (max_len - i - 1)
-        distance += abs(a - b) * weight
+    if max_len <= len(_RELEASE_WEIGHTS):
+        weights = _RELEASE_WEIGHTS[max_len - 1 :: -1]
+    else:
+        weights = [10**k for k in range(max_len - 1, -1, -1)]
+    distance = sum(
+        abs(a - b) * weight
+        for (a, b), weight in zip(
+            zip_longest(ver_release, target_release, fillvalue=0), weights
+        )
+    )
 
     # Add pre-release penalty
     pre_release_penalty = 0
-    if ver.is_prerelease or target.is_prerelease:
+    ver_is_pre = ver.is_prerelease
+    target_is_pre = target.is_prerelease
+    if ver_is_pre or target_is_pre:
         # Penalize pre-releases but still keep them close to their release version
         pre_release_penalty = 0.5
 
         # If both are pre-releases, reduce penalty and compare their order
-        if ver.is_prerelease and target.is_prerelease:
+        if ver_is_pre and target_is_pre:
             pre_release_penalty = 0.25
             # Compare pre-release parts
             if ver.pre and target.pre:
@@ -25,6 +25,8 @@ class PyProjectManager:
         self.file_path = Path(file_path)
         self._data: Optional[tomlkit.TOMLDocument] = None
         self.valid_constraints = VALID_CONSTRAINTS
+        self._in_bulk = False
+        self._dirty = False
 
     @property
     def data(self) -> tomlkit.TOMLDocument:
@@ -82,13 +84,32 @@ class PyProjectManager:
             self.data["project"]["dependencies"] = tomlkit.array()
             self.data["project"]["dependencies"].multiline(True)
 
+    def _save(self) -> None:
+        """Write changes, or defer them while inside a bulk operation"""
+        if self._in_bulk:
+            self._dirty = True
+        else:
+            self._write()
+
+    def flush(self) -> None:
+        """Write pending deferred changes to pyproject.toml"""
+        if self._dirty:
+            self._write()
+            self._dirty = False
+
     @contextmanager
     def bulk_operation(self):
-        """Context manager for bulk operations"""
+        """Context manager for bulk operations
+
+        Changes made inside the block are kept in memory and written once
+        on exit.
+        """
+        self._in_bulk = True
         try:
             yield self
         finally:
-            self._write()
+            self._in_bulk = False
+            self.flush()
 
     def add_dependency(
         self, name: str, version: str, constraint: str = ">="
@@ -100,29 +121,51 @@ class PyProjectManager:
             version: Version string
             constraint: Version constraint (default: ">=")
         """
+        self.add_dependencies([(name, version, constraint)])
+
+    def add_dependencies(self, items: List[Tuple[str, str, str]]) -> None:
+        """Add several dependencies, parsing the existing list only once
+
+        Entries that cannot be parsed are kept as they are.
+
+        Args:
+            items: List of (name, version, constraint) tuples; names can
+                include extras
+        """
         self._ensure_dependencies_table()
         dep_list = self.data["project"]["dependencies"]
 
-        # Parse the new dependency name to get base name and extras
-        new_name, new_extras, _, _ = parse_requirement_string(name)
+        # 既有依賴只解析一次，之後的比對都使用解析結果
+        parsed = []
+        for dep in dep_list:
+            try:
+                current_name, current_extras, _, _ = parse_requirement_string(
+                    dep
+                )
+            except ValueError:
+                current_name, current_extras = None, None
+            parsed.append((current_name, current_extras))
 
-        # Format dependency string
-        dep_str = f"{name}{constraint}{version}"
+        for name, version, constraint in items:
+            # Parse the new dependency name to get base name and extras
+            new_name, new_extras, _, _ = parse_requirement_string(name)
 
-        # Remove existing dependency if present (considering extras)
-        for i, dep in enumerate(dep_list):
-            current_name, current_extras, _, _ = parse_requirement_string(dep)
-            # Compare base names and extras
-            if current_name == new_name:
+            # Remove existing dependency if present (considering extras)
+            for i, (current_name, current_extras) in enumerate(parsed):
                 # If new package has extras, it should replace the one without extras
                 # If current package has extras and new one doesn't, keep the one with extras
-                if new_extras or not current_extras:
+                if current_name == new_name and (
+                    new_extras or not current_extras
+                ):
                     dep_list.pop(i)
+                    parsed.pop(i)
                     break
 
-        # Add new dependency
-        dep_list.append(dep_str)
-        self._write()
+            # Add new dependency
+            dep_list.append(f"{name}{constraint}{version}")
+            parsed.append((new_name, new_extras))
+
+        self._save()
 
     def remove_dependency(self, package_name: str) -> None:
         """
@@ -131,28 +174,39 @@ class PyProjectManager:
         Args:
             package_name: Name of the package to remove (with or without extras)
         """
+        self.remove_dependencies([package_name])
+
+    def remove_dependencies(self, package_names: List[str]) -> None:
+        """
+        Remove several dependencies and all their extras in one pass
+
+        Args:
+            package_names: Names of the packages to remove (with or without
+                extras)
+        """
         if "project" in self.data and "dependencies" in self.data["project"]:
             dep_list = self.data["project"]["dependencies"]
             new_dep_list = tomlkit.array()
             new_dep_list.multiline(True)
 
-            # Parse package name to remove (ignore extras as we'll remove all versions)
-            remove_name, _, _, _ = parse_requirement_string(package_name)
-            normalized_remove_name = canonicalize_name(remove_name)
+            # Parse package names to remove (ignore extras as we'll remove all versions)
+            remove_names = {
+                canonicalize_name(parse_requirement_string(name)[0])
+                for name in package_names
+            }
 
             for dep in dep_list:
                 try:
                     current_name, _, _, _ = parse_requirement_string(dep)
-                    normalized_current_name = canonicalize_name(current_name)
 
                     # Keep package if base name is different
-                    if normalized_current_name != normalized_remove_name:
+                    if canonicalize_name(current_name) not in remove_names:
                         new_dep_list.append(dep)
                 except ValueError:
                     new_dep_list.append(dep)
 
             self.data["project"]["dependencies"] = new_dep_list
-            self._write()
+            self._save()
 
     def bulk_add_dependencies(
         self, dependencies: Dict[str, Union[str, Tuple[str, str]]]
@@ -164,14 +218,15 @@ class PyProjectManager:
                 - version string (uses default >=)
                 - tuple of (version, constraint)
         """
-        with self.bulk_operation():
-            for name, version_info in dependencies.items():
-                if isinstance(version_info, tuple):
-                    version, constraint = version_info
-                else:
-                    version = version_info
-                    constraint = ">="
-                self.add_dependency(name, version, constraint)
+        items = []
+        for name, version_info in dependencies.items():
+            if isinstance(version_info, tuple):
+                version, constraint = version_info
+            else:
+                version = version_info
+                constraint = ">="
+            items.append((name, version, constraint))
+        self.add_dependencies(items)
 
     def get_dependencies(self) -> Dict[str, Tuple[str, str]]:
         """Get dependencies from pyproject.toml
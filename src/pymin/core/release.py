@@ -7,7 +7,6 @@ import importlib.util
 from pathlib import Path
 from typing import Optional, Dict, Any
 import tomllib
-import requests
 from packaging.version import parse, Version
 from rich.prompt import Confirm
 from rich.text import Text
@@ -1,5 +1,4 @@
 # Package name similarity search service with PyPI integration
-import requests
 import re
 from typing import List, Tuple
 from rich.console import Console
@@ -31,6 +30,9 @@ class PackageSearcher:
         if self._packages_cache is not None:
             return self._packages_cache
 
+        # 只在實際查詢時才載入 requests，縮短 CLI 啟動時間
+        import requests
+
         with Live(Text(), refresh_per_second=10, console=console) as live:
             try:
                 live.update(
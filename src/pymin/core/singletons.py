@@ -0,0 +1,18 @@
+"""Shared core instances for command modules"""
+
+from functools import lru_cache
+
+from .package_analyzer import PackageAnalyzer
+from .venv_manager import VenvManager
+
+
+@lru_cache(maxsize=1)
+def get_venv_manager() -> VenvManager:
+    """Get the shared VenvManager, creating it on first use"""
+    return VenvManager()
+
+
+@lru_cache(maxsize=1)
+def get_pkg_analyzer() -> PackageAnalyzer:
+    """Get the shared PackageAnalyzer, creating it on first use"""
+    return PackageAnalyzer()
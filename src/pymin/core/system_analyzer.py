@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Any, List, TypedDict
 import platform
 import subprocess
@@ -58,6 +59,26 @@ class CommandRunner:
             return ""
 
 
+@lru_cache(maxsize=None)
+def _get_python_version(python_path: str) -> str:
+    """Get the version reported by a Python interpreter, cached per path"""
+    return CommandRunner.run_shell(f"{python_path} --version").split()[1]
+
+
+@lru_cache(maxsize=None)
+def _get_base_prefix(python_path: str) -> str:
+    """Get sys.base_prefix of a Python interpreter, cached per path"""
+    return CommandRunner.run_shell(
+        f'{python_path} -c "import sys; print(sys.base_prefix)"'
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_pip_version(pip_path: str) -> str:
+    """Get the version reported by a pip executable, cached per path"""
+    return CommandRunner.run_shell(f"{pip_path} --version").split()[1]
+
+
 class PythonInfo:
     def __init__(self):
         self.current_venv = os.path.dirname(os.path.dirname(sys.executable))
@@ -94,12 +115,8 @@ class PythonInfo:
             }
 
         python_path = python_paths[0]
-        python_version = CommandRunner.run_shell(
-            f"{python_path} --version"
-        ).split()[1]
-        base_prefix = CommandRunner.run_shell(
-            f'{python_path} -c "import sys; print(sys.base_prefix)"'
-        )
+        python_version = _get_python_version(python_path)
+        base_prefix = _get_base_prefix(python_path)
 
         pip_paths = [
             p
@@ -107,11 +124,7 @@ class PythonInfo:
             if p.strip() and not self._is_venv_path(p)
         ]
         pip_path = pip_paths[0] if pip_paths else "not found"
-        pip_version = (
-            CommandRunner.run_shell(f"{pip_path} --version").split()[1]
-            if pip_paths
-            else "unknown"
-        )
+        pip_version = _get_pip_version(pip_path) if pip_paths else "unknown"
 
         return {
             "python": {
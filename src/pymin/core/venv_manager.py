@@ -3,8 +3,10 @@
 import os
 import sys
 import venv
+import shutil
 import subprocess
 from pathlib import Path
+from urllib.parse import urlparse
 from typing import Dict, Any, Optional, Tuple, List
 from .venv_analyzer import VenvAnalyzer
 from ..ui.style import format_env_switch, StyleType
@@ -15,6 +17,9 @@ from .version_utils import parse_requirement_string
 from .events import events, EventType
 from packaging.utils import canonicalize_name
 
+# Resolved shell executables keyed by the $SHELL value
+_SHELL_CACHE: Dict[str, str] = {}
+
 
 class VenvManager:
     """Manager for virtual environment operations"""
@@ -36,7 +41,12 @@ class VenvManager:
 
     def _get_shell(self) -> Tuple[str, str]:
         """Get shell executable and name"""
-        shell = os.environ.get("SHELL", "/bin/sh")
+        shell_env = os.environ.get("SHELL", "/bin/sh")
+        shell = _SHELL_CACHE.get(shell_env)
+        if shell is None:
+            # Resolve bare shell names against PATH once, os.execl needs a path
+            shell = shutil.which(shell_env) or shell_env
+            _SHELL_CACHE[shell_env] = shell
         shell_name = os.path.basename(shell)
         return shell, shell_name
 
@@ -238,14 +248,13 @@ class VenvManager:
             rebuild: Whether to rebuild if environment exists
 
         Returns:
-            Dictionary containing environment information
+            Dictionary containing environment information, including
+            "deps_source" for the project's dependency file
         """
         # Handle rebuilding
         events.emit(EventType.Venv.CREATING, venv_path)
         if venv_path.exists():
             if rebuild:
-                import shutil
-
                 shutil.rmtree(venv_path)
             else:
                 raise ValueError(f"Environment already exists at {venv_path}")
@@ -267,8 +276,27 @@ class VenvManager:
         # Get environment information
         events.emit(EventType.Venv.RETRIEVING, venv_path)
         env_info = self.analyzer.get_venv_info()
+        env_info["deps_source"] = self._detect_deps_source()
         return env_info
 
+    def _detect_deps_source(self) -> Optional[str]:
+        """Detect which dependency file the project uses with one directory scan
+
+        Returns:
+            "requirements", "pyproject" or "lock" if the file exists,
+            otherwise None
+        """
+        with os.scandir(".") as it:
+            entries = {entry.name for entry in it if not entry.is_dir()}
+        if "requirements.txt" in entries:
+            return "requirements"
+        if "pyproject.toml" in entries:
+            return "pyproject"
+        # 只有鎖定檔的專案仍需安裝依賴
+        if "requirements.lock" in entries:
+            return "lock"
+        return None
+
     def install_pyproject_dependencies(self, venv_path: Path) -> None:
         """Install dependencies from pyproject.toml using PackageManager
 
@@ -314,6 +342,46 @@ class VenvManager:
                 f"Failed to install pyproject.toml dependencies: {str(e)}"
             )
 
+    def _find_lock_file(
+        self, requirements_file: Path, has_requirements: bool
+    ) -> Optional[Path]:
+        """Find a pip-compatible lock file for the project
+
+        Args:
+            requirements_file: Path to requirements.txt
+            has_requirements: Whether requirements.txt exists
+
+        Returns:
+            Path to requirements.lock, or to requirements.txt if it pins
+            hashes, otherwise None
+        """
+        lock_file = Path("requirements.lock")
+        if os.access(lock_file, os.F_OK):
+            return lock_file
+
+        # 含 hash 的 requirements.txt（例如 pip-compile 產生）視為鎖定檔
+        if has_requirements:
+            with open(requirements_file, "r") as f:
+                if any("--hash=" in line for line in f):
+                    return requirements_file
+        return None
+
+    def _has_url_hashes(self, requirements_file: Path) -> bool:
+        """Check whether requirements.txt pins direct URLs by sha256 fragment
+
+        Args:
+            requirements_file: Path to requirements.txt
+
+        Returns:
+            True if any requirement URL carries a #sha256= fragment
+        """
+        with open(requirements_file, "r") as f:
+            return any(
+                "sha256=" in urlparse(line.strip()).fragment
+                for line in f
+                if "://" in line
+            )
+
     def install_requirements(self, venv_path: Path) -> None:
         """Install requirements from requirements.txt using PackageManager
 
@@ -323,15 +391,40 @@ class VenvManager:
         requirements_file = Path("requirements.txt")
         pyproject_path = Path("pyproject.toml")
 
-        if not requirements_file.exists() and not pyproject_path.exists():
-            return
+        # 只需要存在與否，用 os.access 取代完整的 stat，且只檢查一次
+        has_requirements = os.access(requirements_file, os.F_OK)
+        has_pyproject = os.access(pyproject_path, os.F_OK)
 
         try:
+            # 鎖定檔可能是專案唯一的依賴檔，需在確認沒有依賴檔之前先找
+            lock_file = self._find_lock_file(
+                requirements_file, has_requirements
+            )
+            if not lock_file and not has_requirements and not has_pyproject:
+                return
+
             # Create a temporary package manager for this venv
             temp_package_manager = PackageManager(venv_path)
 
+            # 鎖定檔已包含完整依賴，直接一次安裝，不重寫 requirements.txt
+            if lock_file:
+                temp_package_manager.install_lock_file(lock_file)
+                if hasattr(self, "package_analyzer"):
+                    self.package_analyzer.clear_cache()
+                return
+
+            # URL 片段已帶 sha256 的直接參照由 pip 直接以片段驗證，
+            # 不重寫檔案以免遺失這些參照，但仍需解析依賴
+            if has_requirements and self._has_url_hashes(requirements_file):
+                temp_package_manager.install_lock_file(
+                    requirements_file, no_deps=False
+                )
+                if hasattr(self, "package_analyzer"):
+                    self.package_analyzer.clear_cache()
+                return
+
             # Handle case sensitivity and duplicates in requirements.txt
-            if requirements_file.exists():
+            if has_requirements:
                 # Read and parse all requirements
                 normalized_packages = {}  # Track processed packages
                 with open(requirements_file, "r") as f:
@@ -378,13 +471,13 @@ class VenvManager:
             requirements = []
             pyproject_deps = {}
 
-            if pyproject_path.exists():
+            if has_pyproject:
                 from .pyproject_manager import PyProjectManager
 
                 proj_manager = PyProjectManager(pyproject_path)
                 pyproject_deps = proj_manager.get_dependencies()
 
-            if requirements_file.exists():
+            if has_requirements:
                 with open(requirements_file, "r") as f:
                     requirements = [
                         line.strip()
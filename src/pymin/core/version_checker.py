@@ -5,7 +5,6 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import tomllib
-import requests
 import importlib.metadata
 from packaging.version import parse as parse_version
 from ..ui.console import console
@@ -39,7 +38,9 @@ def check_for_updates() -> None:
                         )
                     return
 
-        # Get latest version from PyPI
+        # Get latest version from PyPI; requests is only needed once a day
+        import requests
+
         response = requests.get("https://pypi.org/pypi/pymin/json", timeout=5)
         if response.status_code == 200:
             latest_version = response.json()["info"]["version"]
@@ -8,6 +8,10 @@ from packaging.specifiers import SpecifierSet
 
 VERSION_CONSTRAINTS = Literal[">=", "==", "<=", "!=", "~=", ">", "<"]
 VALID_CONSTRAINTS = [">=", "==", "<=", "!=", "~=", ">", "<"]
+# Tuple form for str.startswith, two-character operators first
+CONSTRAINT_PREFIXES = tuple(VALID_CONSTRAINTS)
+# Leading constraint operator, matched in a single pass
+CONSTRAINT_PREFIX_PATTERN = re.compile(r"^(?:>=|==|<=|!=|~=|>|<)")
 
 # Version pattern following PEP 440 and common practices
 VERSION_PATTERN = re.compile(
@@ -1,13 +1,22 @@
 """Console output handling with consistent styling"""
 
+import sys
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from rich.status import Status
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    BarColumn,
+    MofNCompleteColumn,
+)
 from rich.box import DOUBLE
 from typing import Dict, List, Optional, Union, Literal
 from contextlib import contextmanager
+from functools import partial
 
 from pymin.core.package_analyzer import PackageStatus
 from ..ui.style import (
@@ -87,6 +96,73 @@ def progress_status(
         post_callback()
 
 
+@contextmanager
+def progress_counter(message: str, total: int):
+    """Display a progress bar with a completed/total counter.
+
+    Args:
+        message: The message to display
+        total: Number of items to process
+
+    Example:
+        with progress_counter("Adding packages...", len(names)) as advance:
+            for name in names:
+                add_package(name)
+                advance()
+    """
+    with Progress(
+        SpinnerColumn(spinner_name="dots", style=f"{StyleType.LOADING}"),
+        TextColumn(f"[{StyleType.LOADING}]{{task.description}}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task(message, total=total)
+        yield lambda: progress.advance(task)
+
+
+def confirm(message: str, default: bool = False) -> bool:
+    """Ask a yes/no question answered with a single key press.
+
+    Falls back to rich's Confirm prompt when stdin is not a terminal.
+
+    Args:
+        message: The question to display
+        default: Answer used for any key other than y/n (e.g. Enter)
+
+    Returns:
+        True if the user confirmed
+    """
+    if not sys.stdin.isatty():
+        from rich.prompt import Confirm
+
+        return Confirm.ask(message, default=default)
+
+    hint = "\\[Y/n]" if default else "\\[y/N]"
+    console.print(f"{message} [bold magenta]{hint}[/bold magenta] ", end="")
+    if sys.platform == "win32":
+        import msvcrt
+
+        key = msvcrt.getwch()
+    else:
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            key = sys.stdin.read(1)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+    key = key.lower()
+    answer = key == "y" if key in ("y", "n") else default
+    console.print("y" if answer else "n")
+    return answer
+
+
 def start_status(message: str) -> None:
     """Start displaying a status message"""
     global _current_status
@@ -349,19 +425,20 @@ def create_dependency_tree(packages: Dict[str, Dict]) -> Table:
         # Add dependencies
         if "dependencies" in data:
             deps = list(data["dependencies"].items())
+            # 子節點共用同一個串列，進入時 push、離開時 pop，不必逐一複製
+            if level > 0:
+                parent_is_last.append(is_last)
             for i, (dep_name, dep_data) in enumerate(deps):
                 is_last_dep = i == len(deps) - 1
-                current_parent_is_last = parent_is_last.copy()
-                if level > 0:
-                    current_parent_is_last.append(is_last)
-
                 add_package_to_table(
                     dep_name,
                     dep_data,
                     level + 1,
                     is_last_dep,
-                    current_parent_is_last,
+                    parent_is_last,
                 )
+            if level > 0:
+                parent_is_last.pop()
 
         # Add empty line between top-level packages
         if level == 0 and not is_last:
@@ -375,15 +452,18 @@ def create_dependency_tree(packages: Dict[str, Dict]) -> Table:
     return table
 
 
+# 預先套用預設面板樣式，避免每次建立面板都重新讀取設定
+_make_panel = partial(
+    Panel.fit,
+    title_align=DEFAULT_PANEL.title_align,
+    border_style=DEFAULT_PANEL.border_style,
+    padding=DEFAULT_PANEL.padding,
+)
+
+
 def create_summary_panel(title: str, content: Union[str, Text]) -> Panel:
     """Create summary panel with consistent styling"""
-    return Panel.fit(
-        content,
-        title=title,
-        title_align=DEFAULT_PANEL.title_align,
-        border_style=DEFAULT_PANEL.border_style,
-        padding=DEFAULT_PANEL.padding,
-    )
+    return _make_panel(content, title=title)
 
 
 def display_panel(title: str, content: Union[str, Text]) -> None:
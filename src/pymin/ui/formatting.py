@@ -98,9 +98,12 @@ class Text(RichText):
         Returns:
             self for method chaining
         """
+        # 先收集所有片段，最後一次寫入
+        tokens = []
+
         # Add line before if requested
         if add_line_before:
-            self.append("\n")
+            tokens.append(("\n", None))
 
         # Calculate indentation
         indent_str = " " * (indent * 2)
@@ -118,21 +121,26 @@ class Text(RichText):
         else:
             formatted_label = f"{indent_str}{label}:"
 
-        # Append label
-        self.append(formatted_label, style=label_style)
-        self.append(" ")
-
-        # Append value
-        self.append(value, style=value_style)
+        # Label and value
+        tokens.append((formatted_label, label_style))
+        tokens.append((" ", None))
+        if isinstance(value, str):
+            tokens.append((value, value_style))
+        else:
+            # 非字串的值（例如 Text）需經由 append 處理
+            self.append_tokens(tokens)
+            self.append(value, style=value_style)
+            tokens = []
 
         # Append note if provided
         if note:
-            self.append(note_format.format(note=note), style=note_style)
+            tokens.append((note_format.format(note=note), note_style))
 
         # Add line after if requested
         if add_line_after:
-            self.append("\n")
+            tokens.append(("\n", None))
 
+        self.append_tokens(tokens)
         return self
 
     def __str__(self) -> str:
@@ -122,6 +122,49 @@ def test_bulk_add_dependencies(empty_pyproject):
     assert deps["uvicorn"] == ("==", "0.22.0")
 
 
+def test_add_and_remove_dependencies_in_batch(sample_pyproject):
+    """Test adding and removing several dependencies in one call"""
+    manager = PyProjectManager(sample_pyproject)
+
+    manager.add_dependencies(
+        [
+            ("fastapi", "0.100.0", ">="),
+            ("requests", "2.32.0", "=="),
+            ("fastapi", "0.101.0", ">="),
+        ]
+    )
+
+    dep_list = list(manager.data["project"]["dependencies"])
+    assert "requests==2.32.0" in dep_list
+    assert "requests>=2.31.0" not in dep_list
+    assert [d for d in dep_list if "fastapi" in d] == ["fastapi>=0.101.0"]
+
+    manager.remove_dependencies(["fastapi", "Click"])
+
+    deps = manager.get_dependencies()
+    assert "fastapi" not in deps
+    assert "click" not in deps
+    assert deps["requests"] == ("==", "2.32.0")
+
+
+def test_bulk_operation_defers_write(sample_pyproject):
+    """Test that changes inside bulk_operation are written once on exit"""
+    manager = PyProjectManager(sample_pyproject)
+    original = sample_pyproject.read_text(encoding="utf-8")
+
+    with manager.bulk_operation():
+        manager.add_dependency("fastapi", "0.100.0", ">=")
+        manager.remove_dependency("click")
+        # File should be untouched until the block exits
+        assert sample_pyproject.read_text(encoding="utf-8") == original
+
+    with open(sample_pyproject, "r", encoding="utf-8") as f:
+        content = tomlkit.parse(f.read())
+
+    assert "fastapi>=0.100.0" in content["project"]["dependencies"]
+    assert "click>=8.0.0" not in content["project"]["dependencies"]
+
+
 @pytest.mark.parametrize(
     "version,expected",
     [